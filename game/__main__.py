@@ -1,12 +1,36 @@
 from __future__ import annotations
 
-from game.app import run
+import sys
 
 
 def main() -> None:
+    argv = sys.argv[1:]
+    if "--headless" in argv:
+        # Imported lazily so the headless runner never loads pyxel.
+        from game.headless import main as headless_main
+
+        argv.remove("--headless")
+        raise SystemExit(headless_main(argv))
+    if "--farm" in argv:
+        from game.farm import main as farm_main
+
+        argv.remove("--farm")
+        raise SystemExit(farm_main(argv))
+    if "--solve" in argv:
+        from game.solver import main as solve_main
+
+        argv.remove("--solve")
+        raise SystemExit(solve_main(argv))
+    if "--sweep" in argv:
+        from game.sweep import main as sweep_main
+
+        argv.remove("--sweep")
+        raise SystemExit(sweep_main(argv))
+
+    from game.app import run
+
     run()
 
 
 if __name__ == "__main__":
     main()
-
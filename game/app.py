@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import random
 import os
+from dataclasses import replace
 
 import pyxel
 
 from game.audio import AudioManager
+from game.clock import FixedStepClock
 from game.config import GameConfig
-from game.constants import FPS, HEIGHT, WIDTH
+from game.constants import FPS, HEIGHT, MAX_CATCHUP_STEPS, SIM_HZ, WIDTH
 from game.dotenv import load_dotenv
 from game.input import InputState, read_input
 from game.scenes.base import SceneChange
@@ -25,7 +26,7 @@ class GameApp:
     def __init__(self) -> None:
         load_dotenv()
         pyxel.init(WIDTH, HEIGHT, title="Vertical Jump", fps=FPS)
-        self._dt = 1.0 / FPS
+        self._clock = FixedStepClock(1.0 / SIM_HZ, max_steps=MAX_CATCHUP_STEPS)
 
         self._cfg = GameConfig.load()
         if self._cfg.lang and str(self._cfg.lang).strip().lower() not in {"", "auto"}:
@@ -40,13 +41,14 @@ class GameApp:
             "guardian": GuardianScene(self._audio, self._utext),
             "loading": LoadingScene(self._utext),
             "intro": IntroScene(self._audio, self._utext, self._cfg),
-            "play": PlayScene(self._audio, self._utext, self._cfg, rng=random.Random(1234)),
+            "play": PlayScene(self._audio, self._utext, self._cfg, clock=self._clock),
             "game_over": GameOverScene(self._audio, self._scores, self._utext, self._cfg),
         }
         self._current = self._scenes["title"]
         self._current.enter({})
 
         self._prev_inp: InputState | None = None
+        self._pending_inp: InputState | None = None
         self._audio_unlocked_once = False
 
     def update(self) -> None:
@@ -58,15 +60,34 @@ class GameApp:
             self._audio.unlock()
             self._audio_unlocked_once = True
 
-        try:
-            change = self._current.update(self._dt, inp)
-        except SystemExit:
-            pyxel.quit()
+        # Edge-triggered inputs (press/release/confirm/back) must reach exactly one
+        # simulation step, even on frames that run zero steps.
+        if self._pending_inp is not None:
+            p = self._pending_inp
+            inp = replace(
+                inp,
+                jump_pressed=inp.jump_pressed or p.jump_pressed,
+                jump_released=inp.jump_released or p.jump_released,
+                confirm=inp.confirm or p.confirm,
+                back=inp.back or p.back,
+            )
+        steps = self._clock.tick()
+        if steps == 0:
+            self._pending_inp = inp
             return
+        self._pending_inp = None
 
-        if isinstance(change, SceneChange):
-            self._current = self._scenes[change.next_scene]
-            self._current.enter(change.payload)
+        for _ in range(steps):
+            try:
+                change = self._current.update(self._clock.step_dt, inp)
+            except SystemExit:
+                pyxel.quit()
+                return
+
+            if isinstance(change, SceneChange):
+                self._current = self._scenes[change.next_scene]
+                self._current.enter(change.payload)
+            inp = replace(inp, jump_pressed=False, jump_released=False, confirm=False, back=False)
 
     def draw(self) -> None:
         self._current.draw()
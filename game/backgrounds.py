@@ -1,43 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 import pyxel
 
 from game.pixel_art import zone_tile
+from game.zones import ZONES, Zone, zone_for_floor  # noqa: F401  (re-export)
 
 
-@dataclass(frozen=True)
-class Zone:
-    index: int
-    name_jp: str
-    name_en: str
-    bg: int
-    dot: int
-    accent: int
-
-
-ZONES: list[Zone] = [
-    Zone(0, "砂浜", "Beach", bg=15, dot=10, accent=4),
-    Zone(1, "道路", "Road", bg=6, dot=5, accent=0),
-    Zone(2, "村", "Village", bg=11, dot=3, accent=4),
-    Zone(3, "町", "Town", bg=13, dot=6, accent=1),
-    Zone(4, "山", "Mountain", bg=3, dot=11, accent=0),
-    Zone(5, "富士山", "Mt. Fuji", bg=12, dot=6, accent=7),
-    Zone(6, "空", "Sky", bg=12, dot=7, accent=6),
-    Zone(7, "宇宙", "Space", bg=1, dot=13, accent=7),
-    Zone(8, "月", "Moon", bg=5, dot=6, accent=7),
-    Zone(9, "火星", "Mars", bg=2, dot=4, accent=8),
-    Zone(10, "天国", "Heaven", bg=7, dot=15, accent=14),
-]
-
-
-def zone_for_floor(floor: int, *, step: int) -> Zone:
-    if step <= 0:
-        step = 10
-    idx = max(0, floor // step)
-    return ZONES[min(idx, len(ZONES) - 1)]
-
 def _floor_for_world_y(*, start_y: float, world_y: float, floor_height_px: int) -> int:
     if floor_height_px <= 0:
         floor_height_px = 120
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+
+from game.constants import PLAYER_H, PLAYER_W, PLAYER_X_FRICTION
+from game.entities.platform import Platform
+from game.input import InputState
+from game.trajectory import table_for
+from game.world import PlayWorld
+
+
+class HeuristicBot:
+    """
+    Input provider that climbs like a (careful) player, for benchmarks and soak runs.
+
+    Whenever it stands still on a platform it re-plans with the player's `JumpTable`
+    (jump_mult / gravity_mult / speed_mult, item boosts included): the target is the
+    highest platform above whose top is below the full-charge apex and whose nearest
+    edge can be reached sideways during the flight from somewhere on the current
+    platform. It walks to that take-off point, holds jump until `player.charge` reaches
+    the table's charge for an apex `margin` px above the target top, releases, and
+    steers toward the target while airborne. With nothing reachable it takes a full
+    jump toward the next platform up.
+    """
+
+    def __init__(self, margin: float = 24.0, air_control: float = 0.9) -> None:
+        self.margin = margin
+        self.air_control = air_control
+        self._target: Platform | None = None
+        self._goal_x = 0.0
+        self._charge_goal = 1.0
+        self._prev_down = False
+
+    @staticmethod
+    def _ground(world: PlayWorld) -> Platform | None:
+        p = world.player
+        feet = p.y + PLAYER_H
+        for plat in world.platforms.tops_between(feet - 1, feet + 1):
+            if plat.rect.left < p.x + PLAYER_W and plat.rect.right > p.x:
+                return plat
+        return None
+
+    @staticmethod
+    def _steer(cx: float, vx: float, goal: float, tol: float) -> tuple[bool, bool]:
+        """(left, right) toward `goal`, coasting once friction alone would stop there."""
+        dist = goal - cx
+        if abs(dist) <= tol:
+            return False, False
+        stop = vx * vx / (2.0 * PLAYER_X_FRICTION)
+        if vx * dist > 0 and abs(dist) <= stop + tol:
+            return False, False
+        return dist < 0, dist > 0
+
+    def _plan(self, world: PlayWorld) -> None:
+        p = world.player
+        feet = p.y + PLAYER_H
+        table = table_for(world)
+        apex = table.apex(1.0)
+        cx = p.x + PLAYER_W / 2
+        ground = self._ground(world)
+        # Centre-x range the player can take off from without walking off the edge.
+        lo, hi = (ground.rect.left + PLAYER_W / 2 + 4, ground.rect.right - PLAYER_W / 2 - 4) if ground else (cx, cx)
+
+        target: Platform | None = None
+        goal_x = cx
+        charge = 1.0
+        fallback: Platform | None = None
+        fallback_gap = math.inf
+        fallback_x = cx
+        # Highest first, so the first reachable candidate skips the most rows.
+        for plat in world.platforms.tops_between(feet - apex, feet - 8):
+            rise = feet - plat.rect.top
+            c = table.charge_for(min(apex, rise + self.margin))
+            steps = table.air_steps(c, rise) if c is not None else None
+            if steps is None:
+                continue
+            # Nearest take-off point to the target's span (a little inside its edges).
+            t_lo = plat.rect.left + PLAYER_W / 2
+            t_hi = plat.rect.right - PLAYER_W / 2
+            x = min(max(cx, t_lo), t_hi)
+            x = min(max(x, lo), hi)
+            gap = max(0.0, t_lo - x, x - t_hi)
+            if gap <= table.reach_px(steps) * self.air_control:
+                target, goal_x, charge = plat, x, c
+                break
+            if gap < fallback_gap:
+                fallback, fallback_gap, fallback_x = plat, gap, x
+        if target is None and fallback is not None:
+            # Nothing provably reachable: full jump from the closest take-off point anyway.
+            target, goal_x, charge = fallback, fallback_x, 1.0
+
+        self._target = target
+        self._goal_x = goal_x
+        self._charge_goal = charge
+
+    def __call__(self, world: PlayWorld) -> InputState:
+        p = world.player
+        cx = p.x + PLAYER_W / 2
+        if p.grounded and not self._prev_down:
+            self._plan(world)
+        target = self._target
+
+        left = right = down = False
+        if target is not None:
+            if p.grounded:
+                if not self._prev_down and (abs(cx - self._goal_x) > 4 or abs(p.vx) > 60):
+                    left, right = self._steer(cx, p.vx, self._goal_x, 4)
+                else:
+                    # Hold until the charge gives the planned launch speed, then release.
+                    down = not self._prev_down or p.charge < self._charge_goal
+            else:
+                tx = min(max(cx, target.rect.left + PLAYER_W / 2 + 8), target.rect.right - PLAYER_W / 2 - 8)
+                left, right = self._steer(cx, p.vx, tx, 4)
+
+        inp = InputState(
+            left=left,
+            right=right,
+            jump_down=down,
+            jump_pressed=down and not self._prev_down,
+            jump_released=self._prev_down and not down,
+        )
+        self._prev_down = down
+        return inp
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+from game.constants import HEIGHT, PLAYER_W, WIDTH
+from game.rng import substream
+from game.trajectory import JumpTable, jump_table
+from game.util import clamp
+
+if TYPE_CHECKING:
+    from game.layout_cache import LayoutCache
+
+# Bump whenever `generate_chunk` output changes: stored layouts of other versions are ignored.
+GENERATOR_VERSION = 2
+# A chunk is about one screen of rows: it ends with the first row at or above its top edge.
+CHUNK_PX = HEIGHT
+# Chunks kept ready ahead of the one being spawned from.
+LOOKAHEAD_CHUNKS = 3
+# Per-frame generation time when no worker thread can run (web build).
+FRAME_BUDGET_S = 0.002
+
+# Rolls per row before nudging it into reach, and the clearance a jump needs above a top.
+_REACH_ROLLS = 3
+_REACH_MARGIN_PX = 12
+
+# Giants (last) only join the enemy pool from GIANT_MIN_FLOOR on.
+ITEM_KINDS: tuple[str, ...] = ("speed", "jump", "phase", "invuln", "hp")
+ENEMY_KINDS: tuple[str, ...] = ("walker", "spiker", "flyer", "jumper", "giant")
+_ITEM_WEIGHTS = (28, 26, 16, 16, 14)
+_ENEMY_WEIGHTS = (32, 22, 20, 18, 8)
+_ENEMY_CUM_WEIGHTS = tuple(accumulate(_ENEMY_WEIGHTS))
+GIANT_MIN_FLOOR = 10
+
+
+@dataclass(frozen=True)
+class LayoutKey:
+    seed: int
+    start_y: int
+    jump_mult: float
+    gravity_mult: float
+    speed_mult: float
+
+    def table(self) -> JumpTable:
+        return jump_table(self.jump_mult, self.gravity_mult, self.speed_mult)
+
+
+@dataclass(frozen=True)
+class Row:
+    """`y` is absolute (origin_y = 0); the enemy is rolled with and without giants in the pool."""
+
+    x: int
+    y: int
+    w: int
+    item: str | None = None
+    enemy: str | None = None
+    enemy_with_giants: str | None = None
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    rows: tuple[Row, ...]
+
+    @property
+    def tail(self) -> Row:
+        return self.rows[-1]
+
+
+def _pick_enemy(roll: float, n: int) -> str:
+    # Same pick as random.choices(ENEMY_KINDS[:n], weights=_ENEMY_WEIGHTS[:n]) for this random() roll.
+    return ENEMY_KINDS[bisect(_ENEMY_CUM_WEIGHTS, roll * _ENEMY_CUM_WEIGHTS[n - 1], 0, n - 1)]
+
+
+def _landing_gap(prev: Row, x: int, width: int) -> float:
+    """Sideways distance between standing fully on `prev` and landing on [x, x + width)."""
+    take_lo = prev.x + PLAYER_W / 2
+    take_hi = prev.x + prev.w - PLAYER_W / 2
+    land_lo = x + PLAYER_W / 2
+    land_hi = x + width - PLAYER_W / 2
+    return max(0.0, land_lo - take_hi, take_lo - land_hi)
+
+
+def _reachable(table: JumpTable, prev: Row, x: int, width: int, rise: int) -> bool:
+    return table.can_reach(rise + _REACH_MARGIN_PX, _landing_gap(prev, x, width))
+
+
+def chunk_top(ground: Row, index: int) -> int:
+    """Absolute y of the top edge of chunk `index` (chunk 0 starts at the ground)."""
+    return ground.y - (index + 1) * CHUNK_PX
+
+
+def generate_chunk(key: LayoutKey, index: int, tail: Row, ground: Row) -> Chunk:
+    """Rows of chunk `index` above `tail`; pure, since each chunk has its own RNG streams."""
+    rng = substream(key.seed, f"level/{index}")
+    erng = substream(key.seed, f"enemies/{index}")
+    # Reachable with the character's own jump; the nudge is reachable by construction.
+    table = key.table()
+    top = chunk_top(ground, index)
+    prev = tail
+    rows: list[Row] = []
+    while not rows or prev.y > top:
+        for _ in range(_REACH_ROLLS):
+            gap = rng.randint(70, 130)
+            width = rng.randint(120, 240)
+            x = rng.randint(20, WIDTH - 20 - width)
+            if _reachable(table, prev, x, width, gap):
+                break
+        else:
+            gap = min(gap, int(table.apex(1.0)) - _REACH_MARGIN_PX)
+            x = int(clamp(x, prev.x - width + 2 * PLAYER_W, prev.x + prev.w - 2 * PLAYER_W))
+            x = int(clamp(x, 20, WIDTH - 20 - width))
+        y = prev.y - gap
+
+        item = None
+        if rng.random() < 0.22:
+            item = rng.choices(ITEM_KINDS, weights=_ITEM_WEIGHTS, k=1)[0]
+
+        enemy = enemy_with_giants = None
+        if erng.random() < 0.18:
+            roll = erng.random()
+            enemy = _pick_enemy(roll, len(ENEMY_KINDS) - 1)
+            enemy_with_giants = _pick_enemy(roll, len(ENEMY_KINDS))
+
+        prev = Row(x, y, width, item, enemy, enemy_with_giants)
+        rows.append(prev)
+    return Chunk(index, tuple(rows))
+
+
+class ChunkGenerator:
+    """
+    Builds chunks ahead of play on a worker thread, or via `pump()` where threads are
+    unavailable; a chunk not ready yet is built on the spot.
+    """
+
+    def __init__(self, lookahead: int = LOOKAHEAD_CHUNKS) -> None:
+        self.lookahead = max(1, int(lookahead))
+        self._cond = threading.Condition()
+        self._key: LayoutKey | None = None
+        self._ground: Row | None = None
+        self._ready: dict[int, Chunk] = {}
+        # Chunks 0..n-1 of the current layout, from the cache or handed out before.
+        self._known: list[Chunk] = []
+        self._saved = 0
+        self.cache: LayoutCache | None = None
+        self._cursor = 0
+        self._tail: Row | None = None
+        self._want = -1
+        # Bumped on restart so an in-flight build can tell it's stale.
+        self._epoch = 0
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.streamed = 0
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+
+    def configure(self, key: LayoutKey, ground: Row) -> None:
+        with self._cond:
+            if key == self._key and ground == self._ground:
+                return
+        known = self.cache.load(key, ground) if self.cache is not None else []
+        with self._cond:
+            self._key = key
+            self._ground = ground
+            self._known = known
+            self._saved = len(known)
+            self._restart(0, ground)
+            self._want = self.lookahead - 1
+            self._cond.notify()
+
+    def _restart(self, cursor: int, tail: Row) -> None:
+        self._ready.clear()
+        known = self._known
+        if cursor < len(known):
+            cursor, tail = len(known), known[-1].tail
+        self._cursor = cursor
+        self._tail = tail
+        self._epoch += 1
+
+    def take(self, index: int, tail: Row) -> Chunk:
+        """Chunk `index` (built from `tail` on a miss); schedules the next `lookahead`."""
+        with self._cond:
+            key = self._key
+            ground = self._ground
+            known = index < len(self._known)
+            chunk = self._known[index] if known else self._ready.pop(index, None)
+        if key is None or ground is None:
+            raise RuntimeError("ChunkGenerator.take() before configure()")
+        missed = chunk is None
+        if chunk is None:
+            chunk = generate_chunk(key, index, tail, ground)
+        with self._cond:
+            if key != self._key:
+                return chunk
+            if known:
+                self.streamed += 1
+            elif missed:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if index == len(self._known):
+                self._known.append(chunk)
+            ahead = index + 1 in self._ready or index + 1 < len(self._known)
+            if self._cursor <= index or (self._cursor > index + 1 and not ahead):
+                # Behind (a miss) or off the chain (a restore): continue from this chunk.
+                self._restart(index + 1, chunk.tail)
+            for i in [i for i in self._ready if i < index]:
+                del self._ready[i]
+            self._want = index + self.lookahead
+            self._cond.notify()
+        return chunk
+
+    def _claim(self) -> tuple[int, LayoutKey, int, Row, Row] | None:
+        # Caller holds the lock.
+        if self._key is None or self._ground is None or self._tail is None or self._cursor > self._want:
+            return None
+        return self._epoch, self._key, self._cursor, self._tail, self._ground
+
+    def _publish(self, epoch: int, chunk: Chunk) -> None:
+        # Caller holds the lock.
+        if epoch != self._epoch or chunk.index != self._cursor:
+            return
+        self._ready[chunk.index] = chunk
+        self._cursor += 1
+        self._tail = chunk.tail
+        self.built += 1
+
+    def pump(self, budget_s: float = FRAME_BUDGET_S) -> int:
+        """Build wanted chunks until `budget_s` is spent (at least one if any is due)."""
+        deadline = time.perf_counter() + budget_s
+        n = 0
+        while True:
+            with self._cond:
+                job = self._claim()
+            if job is None:
+                return n
+            epoch, key, index, tail, ground = job
+            chunk = generate_chunk(key, index, tail, ground)
+            with self._cond:
+                self._publish(epoch, chunk)
+            n += 1
+            if time.perf_counter() >= deadline:
+                return n
+
+    def start_worker(self) -> bool:
+        """Build chunks on a daemon thread; False if this runtime can't start threads."""
+        if self._thread is not None:
+            return True
+        self._stopping = False
+        try:
+            t = threading.Thread(target=self._run, name="chunk-generator", daemon=True)
+            t.start()
+        except RuntimeError:
+            return False
+        self._thread = t
+        return True
+
+    def stop_worker(self) -> None:
+        t = self._thread
+        if t is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        t.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job = self._claim()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._claim()
+                if self._stopping:
+                    return
+            epoch, key, index, tail, ground = job
+            chunk = generate_chunk(key, index, tail, ground)
+            with self._cond:
+                self._publish(epoch, chunk)
+
+    def save(self) -> str | None:
+        """Store the current layout in `cache` if this run got further than what's stored."""
+        with self._cond:
+            key = self._key
+            ground = self._ground
+            known = list(self._known)
+        if self.cache is None or key is None or ground is None or len(known) <= self._saved:
+            return None
+        path = self.cache.store(key, ground, known)
+        if path is not None:
+            with self._cond:
+                if key == self._key:
+                    self._saved = len(known)
+        return path
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "streamed": self.streamed,
+                "hits": self.hits,
+                "misses": self.misses,
+                "built": self.built,
+                "ready": len(self._ready),
+                "known": len(self._known),
+            }
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+
+
+class FixedStepClock:
+    """
+    Real-time accumulator that turns wall-clock frame times into fixed simulation steps.
+
+    `tick()` returns how many steps of `step_dt` to run this frame. At most `max_steps`
+    are run per frame; any backlog beyond that is dropped so a long stall (tab switch,
+    first-time sprite build) slows the game briefly instead of spiralling. `alpha` is
+    the leftover fraction of a step, for blending previous/current state when drawing.
+    """
+
+    # Frame times this close to one step are treated as exactly one step, so normal
+    # 60 Hz timer jitter doesn't alternate between 0 and 2 steps per frame. The snapped
+    # difference is kept and paid back once it adds up to SNAP_S, so game time still
+    # tracks wall time at any frame rate (jitter cancels out before that).
+    SNAP_S = 0.002
+
+    def __init__(self, step_dt: float, max_steps: int = 5) -> None:
+        self.step_dt = float(step_dt)
+        self.max_steps = max(1, int(max_steps))
+        self.alpha = 1.0
+        self._accum = 0.0
+        self._snap_err = 0.0
+        self._last: float | None = None
+
+    def tick(self, now: float | None = None) -> int:
+        if now is None:
+            now = time.perf_counter()
+        if self._last is None:
+            elapsed = self.step_dt
+        else:
+            elapsed = max(0.0, now - self._last)
+        self._last = now
+        return self.advance(elapsed)
+
+    def advance(self, elapsed: float) -> int:
+        dt = self.step_dt
+        if abs(elapsed - dt) < self.SNAP_S:
+            self._snap_err += elapsed - dt
+            elapsed = dt
+            if abs(self._snap_err) >= self.SNAP_S:
+                elapsed += self._snap_err
+                self._snap_err = 0.0
+        self._accum += elapsed
+        steps = min(self.max_steps, int(self._accum / dt + 1e-9))
+        self._accum = max(0.0, self._accum - steps * dt)
+        if steps == self.max_steps and self._accum >= dt:
+            self._accum %= dt
+        self.alpha = self._accum / dt
+        return steps
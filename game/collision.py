@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from operator import itemgetter
+from typing import TypeVar
+
+from game.geom import Rect
+from game.spatial import HasRect
+
+T = TypeVar("T", bound=HasRect)
+
+_INF = float("inf")
+_TOI = itemgetter(0)
+
+
+def _axis(a0: float, a1: float, d: float, b0: float, b1: float) -> tuple[float, float] | None:
+    """Entry/exit times of interval [a0, a1) moving by `d` against static [b0, b1)."""
+    if d == 0.0:
+        if a0 < b1 and a1 > b0:
+            return -_INF, _INF
+        return None
+    if d > 0.0:
+        return (b0 - a1) / d, (b1 - a0) / d
+    return (b1 - a0) / d, (b0 - a1) / d
+
+
+def sweep_aabb(rect: Rect, dx: float, dy: float, target: Rect) -> float | None:
+    """
+    Time of impact of `rect` translated by (dx, dy) against a static `target`.
+
+    Returns the fraction of the move (0..1) at which the boxes first overlap, 0.0 if
+    they already overlap at the start, or None if they never overlap during the move.
+    Edges are half-open like `Rect.colliderect`, so merely touching is not a contact.
+    """
+    ax = _axis(rect.x, rect.right, dx, target.x, target.right)
+    if ax is None:
+        return None
+    ay = _axis(rect.y, rect.bottom, dy, target.y, target.bottom)
+    if ay is None:
+        return None
+    enter = max(ax[0], ay[0])
+    leave = min(ax[1], ay[1])
+    if enter >= leave or leave <= 0.0 or enter >= 1.0:
+        return None
+    return max(0.0, enter)
+
+
+def swept_contacts(
+    rect: Rect, dx: float, dy: float, candidates: Iterable[T], out: list[tuple[float, T]] | None = None
+) -> list[tuple[float, T]]:
+    """
+    `(toi, obj)` for every candidate the moving `rect` touches, earliest first.
+
+    Ties keep candidate order (spawn order from the broad phase), so resolution stays
+    deterministic. Pass a scratch list as `out` to reuse it instead of allocating one.
+    """
+    hits: list[tuple[float, T]] = [] if out is None else out
+    hits.clear()
+    for obj in candidates:
+        toi = sweep_aabb(rect, dx, dy, obj.rect)
+        if toi is not None:
+            hits.append((toi, obj))
+    if len(hits) > 1:
+        hits.sort(key=_TOI)
+    return hits
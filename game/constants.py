@@ -3,8 +3,14 @@ from __future__ import annotations
 WIDTH = 960
 HEIGHT = 540
 FPS = 60
+# Fixed simulation rate, and how many steps a slow frame may catch up before time is dropped.
+SIM_HZ = 60
+MAX_CATCHUP_STEPS = 5
 
 FLOOR_HEIGHT_PX = 120
+# Floating origin: once the camera is this many floors above y=0, the world is shifted
+# back down by whole floors so coordinates stay small on endless climbs.
+REBASE_FLOORS = 50
 
 GRAVITY = 2400.0
 
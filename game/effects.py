@@ -4,8 +4,8 @@ import math
 import random
 from dataclasses import dataclass
 
-import pyxel
-
+from game.constants import HEIGHT, WIDTH
+from game.np_compat import np
 from game.util import clamp
 
 
@@ -43,58 +43,145 @@ class HitStop:
         return True
 
 
-@dataclass
-class Particle:
-    x: float
-    y: float
-    vx: float
-    vy: float
-    radius: float
-    color: int
-    life: float
-
-
 class ParticleSystem:
-    def __init__(self) -> None:
-        self._particles: list[Particle] = []
+    """
+    Fixed-capacity particle ring buffer backed by parallel arrays.
+
+    Bursts write into consecutive slots starting at the ring head, so steady-state play
+    allocates nothing. When the head slot still holds a live particle the buffer is
+    full, and `overflow` decides what happens: "drop_oldest" overwrites it (ring order
+    is spawn order), "reject_new" drops the rest of the burst. Integration runs as
+    vector ops when NumPy is available; without it the same arrays are plain lists.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "reject_new")
+
+    def __init__(
+        self, capacity: int = 512, overflow: str = "drop_oldest", rng: random.Random | None = None
+    ) -> None:
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        self.capacity = max(1, int(capacity))
+        self.overflow = overflow
+        # Own stream (e.g. the world's "vfx" stream) so effects never perturb other randomness.
+        self._rng = rng if rng is not None else random.Random()
+        self.dropped = 0
+        self._head = 0
+        n = self.capacity
+        if np is not None:
+            self._x = np.zeros(n)
+            self._y = np.zeros(n)
+            self._vx = np.zeros(n)
+            self._vy = np.zeros(n)
+            self._radius = np.zeros(n)
+            self._life = np.zeros(n)
+            self._color = np.zeros(n, dtype=np.int64)
+        else:
+            self._x = [0.0] * n
+            self._y = [0.0] * n
+            self._vx = [0.0] * n
+            self._vy = [0.0] * n
+            self._radius = [0.0] * n
+            self._life = [0.0] * n
+            self._color = [0] * n
+
+    def __len__(self) -> int:
+        if np is not None:
+            return int(np.count_nonzero(self._life > 0.0))
+        return sum(1 for life in self._life if life > 0.0)
+
+    def clear(self) -> None:
+        if np is not None:
+            self._life[:] = 0.0
+        else:
+            self._life[:] = [0.0] * self.capacity
+        self._head = 0
+        self.dropped = 0
 
     def burst(self, pos: tuple[float, float], color: int, count: int = 14, speed: float = 520.0) -> None:
         ox, oy = pos
+        cap = self.capacity
+        life = self._life
+        rnd = self._rng.random
         for _ in range(count):
-            angle = random.random() * math.tau
-            mag = speed * (0.35 + random.random() * 0.85)
-            vx = math.cos(angle) * mag
-            vy = math.sin(angle) * mag
-            self._particles.append(
-                Particle(
-                    x=ox,
-                    y=oy,
-                    vx=vx,
-                    vy=vy,
-                    radius=2.0 + random.random() * 3.0,
-                    color=color,
-                    life=0.45 + random.random() * 0.35,
-                )
-            )
+            i = self._head
+            if life[i] > 0.0:
+                self.dropped += 1
+                if self.overflow == "reject_new":
+                    continue
+            angle = rnd() * math.tau
+            mag = speed * (0.35 + rnd() * 0.85)
+            self._x[i] = ox
+            self._y[i] = oy
+            self._vx[i] = math.cos(angle) * mag
+            self._vy[i] = math.sin(angle) * mag
+            self._radius[i] = 2.0 + rnd() * 3.0
+            self._color[i] = color
+            life[i] = 0.45 + rnd() * 0.35
+            self._head = (i + 1) % cap
+
+    def shift_y(self, dy: float) -> None:
+        """Move every particle by `dy` (world rebasing)."""
+        if np is not None:
+            self._y += dy
+            return
+        y = self._y
+        for i in range(self.capacity):
+            y[i] += dy
 
     def update(self, dt: float) -> None:
-        alive: list[Particle] = []
-        for p in self._particles:
-            p.life -= dt
-            if p.life <= 0:
+        if np is not None:
+            life = self._life
+            live = life > 0.0
+            if not live.any():
+                return
+            # Dead slots are integrated too (cheaper than masking); they are never drawn.
+            life -= dt
+            self._vy += 1600.0 * dt
+            self._x += self._vx * dt
+            self._y += self._vy * dt
+            np.maximum(self._radius - dt * 6.0, 0.0, out=self._radius)
+            return
+
+        x, y, vx, vy, radius, life = self._x, self._y, self._vx, self._vy, self._radius, self._life
+        for i in range(self.capacity):
+            if life[i] <= 0.0:
                 continue
-            p.vy += 1600.0 * dt
-            p.x += p.vx * dt
-            p.y += p.vy * dt
-            p.radius = max(0.0, p.radius - dt * 6.0)
-            alive.append(p)
-        self._particles = alive
+            life[i] -= dt
+            if life[i] <= 0.0:
+                continue
+            vy[i] += 1600.0 * dt
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            radius[i] = max(0.0, radius[i] - dt * 6.0)
 
     def draw(self, cam_x: float, cam_y: float) -> None:
-        for p in self._particles:
-            if p.radius <= 0.5:
+        import pyxel  # local import: keep effects usable from headless simulation
+
+        if np is not None:
+            r = self._radius
+            sx = self._x - cam_x
+            sy = self._y - cam_y
+            # Cull dead, tiny and off-screen particles before touching pyxel.
+            vis = (self._life > 0.0) & (r > 0.5)
+            vis &= (sx > -r) & (sx < WIDTH + r) & (sy > -r) & (sy < HEIGHT + r)
+            idx = np.flatnonzero(vis)
+            if len(idx) == 0:
+                return
+            xs = sx[idx].astype(np.int64).tolist()
+            ys = sy[idx].astype(np.int64).tolist()
+            rs = r[idx].astype(np.int64).tolist()
+            cs = self._color[idx].tolist()
+            for x, y, rad, col in zip(xs, ys, rs, cs):
+                pyxel.circ(x, y, rad, col)
+            return
+
+        for i in range(self.capacity):
+            rad = self._radius[i]
+            if self._life[i] <= 0.0 or rad <= 0.5:
                 continue
-            x = int(p.x - cam_x)
-            y = int(p.y - cam_y)
-            pyxel.circ(x, y, int(p.radius), p.color)
-
+            x = self._x[i] - cam_x
+            y = self._y[i] - cam_y
+            if x <= -rad or x >= WIDTH + rad or y <= -rad or y >= HEIGHT + rad:
+                continue
+            pyxel.circ(int(x), int(y), int(rad), self._color[i])
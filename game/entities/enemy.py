@@ -1,17 +1,37 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
-
-import pyxel
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 
+from game.entities.ordered import YOrderedDeque
 from game.geom import Rect
-from game.pixel_art import enemy_sprite
-from game.util import clamp
+from game.pool import Pool
+from game.spatial import SpatialHash
+from game.util import clamp, lerp
+
+# kind -> (w, h, vx, vy, can_stomp) at spawn.
+ENEMY_SPECS: dict[str, tuple[int, int, float, float, bool]] = {
+    "walker": (42, 34, 70.0, 0.0, True),
+    "flyer": (46, 30, 110.0, 0.0, True),
+    "jumper": (40, 36, 0.0, 0.0, True),
+    "spiker": (46, 40, 0.0, 0.0, True),
+    "giant": (130, 90, 40.0, 0.0, False),
+}
+
+# Activity LOD, by distance (px) from the visible band: full rate within LOD_FULL_PX,
+# one step every LOD_REDUCED_EVERY frames within LOD_REDUCED_PX, frozen beyond.
+LOD_FULL_PX = 270
+LOD_REDUCED_PX = 540
+LOD_REDUCED_EVERY = 4
+# Gaps longer than this (waking from frozen) are integrated analytically, not stepped.
+LOD_ANALYTIC_S = 0.25
 
 
 @dataclass
 class Enemy:
+    """`x`/`y` are the exact position; `rect` is their floored box."""
+
     kind: str
     rect: Rect
     vx: float
@@ -21,56 +41,67 @@ class Enemy:
 
     t: float = 0.0
     state: int = 0
+    x: float = field(default=0.0, init=False)
+    y: float = field(default=0.0, init=False)
+    prev_x: float = field(default=0.0, init=False)
+    prev_y: float = field(default=0.0, init=False)
+    # Spawn order and last stepped frame, for the activity LOD.
+    seq: int = field(default=0, init=False)
+    lod_frame: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.x = self.prev_x = float(self.rect.x)
+        self.y = self.prev_y = float(self.rect.y)
+
+    def reset(self, kind: str, x: int, y: int) -> None:
+        w, h, vx, vy, can_stomp = ENEMY_SPECS[kind]
+        self.kind = kind
+        self.rect.update(x, y, w, h)
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
+        self.vx = vx
+        self.vy = vy
+        self.alive = True
+        self.can_stomp = can_stomp
+        self.t = 0.0
+        self.state = 0
 
     def update(self, dt: float) -> None:
         self.t += dt
-        self.rect.x += int(self.vx * dt)
-        self.rect.y += int(self.vy * dt)
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.rect.set_pos(math.floor(self.x), math.floor(self.y))
 
-    def draw(self, cam_x: float, cam_y: float, color: int, danger: int) -> None:
+    def draw(self, cam_x: float, cam_y: float, color: int, danger: int, alpha: float = 1.0) -> None:
         if not self.alive:
             return
+        # Local import keeps the simulation importable without pyxel/SDL (headless runs).
+        import pyxel
+
+        from game.pixel_art import enemy_sprite
+
         r = self.rect
-        x = int(r.x - cam_x)
-        y = int(r.y - cam_y)
+        x = int(math.floor(lerp(self.prev_x, self.x, alpha)) - cam_x)
+        y = int(math.floor(lerp(self.prev_y, self.y, alpha)) - cam_y)
         img, sw, sh = enemy_sprite(kind=self.kind, state=self.state, fill=color, danger=danger)
         scale = max(1, min(r.w // sw, r.h // sh))
         pyxel.blt(x, y, img, 0, 0, sw, sh, colkey=0, scale=scale)
 
 
-def make_walker(x: int, y: int) -> Enemy:
-    return Enemy(kind="walker", rect=Rect(x, y, 42, 34), vx=70, vy=0, can_stomp=True)
-
-
-def make_flyer(x: int, y: int) -> Enemy:
-    return Enemy(kind="flyer", rect=Rect(x, y, 46, 30), vx=110, vy=0, can_stomp=True)
-
-
-def make_jumper(x: int, y: int) -> Enemy:
-    return Enemy(kind="jumper", rect=Rect(x, y, 40, 36), vx=0, vy=0, can_stomp=True)
-
-
-def make_spiker(x: int, y: int) -> Enemy:
-    return Enemy(kind="spiker", rect=Rect(x, y, 46, 40), vx=0, vy=0, can_stomp=True)
-
-
-def make_giant(x: int, y: int) -> Enemy:
-    return Enemy(kind="giant", rect=Rect(x, y, 130, 90), vx=40, vy=0, can_stomp=False)
-
-
 def update_enemy_behavior(enemy: Enemy, dt: float, world_bounds_x: tuple[int, int]) -> None:
     if not enemy.alive:
         return
     left_x, right_x = world_bounds_x
-    r = enemy.rect
+    w = enemy.rect.w
+    out = enemy.x < left_x or enemy.x + w > right_x
 
     if enemy.kind == "walker":
-        if r.left < left_x or r.right > right_x:
+        if out:
             enemy.vx *= -1
-            r.x = max(left_x, min(r.x, right_x - r.w))
+            enemy.x = float(max(left_x, min(enemy.x, right_x - w)))
     elif enemy.kind == "flyer":
         enemy.vy = 70.0 * math.sin(enemy.t * 2.3)
-        if r.left < left_x or r.right > right_x:
+        if out:
             enemy.vx *= -1
         enemy.vx = clamp(enemy.vx, -150, 150)
     elif enemy.kind == "jumper":
@@ -83,6 +114,173 @@ def update_enemy_behavior(enemy: Enemy, dt: float, world_bounds_x: tuple[int, in
         phase = (enemy.t % period) / period
         enemy.state = 1 if phase > 0.62 else 0
     elif enemy.kind == "giant":
-        if r.left < left_x or r.right > right_x:
+        if out:
             enemy.vx *= -1
-            r.x = max(left_x, min(r.x, right_x - r.w))
+            enemy.x = float(max(left_x, min(enemy.x, right_x - w)))
+
+
+def _bounce(x: float, vx: float, lo: float, hi: float, elapsed: float) -> tuple[float, float]:
+    """Position and velocity after moving at |vx| for `elapsed` seconds, reflecting off lo/hi."""
+    span = hi - lo
+    if span <= 0 or vx == 0:
+        return x, vx
+    speed = abs(vx)
+    u = x - lo if vx > 0 else 2 * span - (x - lo)
+    m = (u + speed * elapsed) % (2 * span)
+    if m < span:
+        return lo + m, speed
+    return lo + 2 * span - m, -speed
+
+
+def advance_state(
+    kind: str,
+    x: float,
+    y: float,
+    w: int,
+    vx: float,
+    vy: float,
+    t: float,
+    state: int,
+    elapsed: float,
+    world_bounds_x: tuple[int, int],
+) -> tuple[float, float, float, float, float, int]:
+    """Closed-form `elapsed` seconds of behavior + update; returns (x, y, vx, vy, t, state)."""
+    left_x, right_x = world_bounds_x
+    t1 = t + elapsed
+    if kind in ("walker", "giant", "flyer"):
+        x, vx = _bounce(x, vx, left_x, right_x - w, elapsed)
+    if kind == "flyer":
+        y -= 70.0 / 2.3 * (math.cos(t1 * 2.3) - math.cos(t * 2.3))
+        vy = 70.0 * math.sin(t1 * 2.3)
+    elif kind == "jumper":
+        g = 1800.0
+        if state == 0:
+            hop = float(math.ceil(t))
+            if hop <= t1:
+                tau = hop - t
+                y += vy * tau + 0.5 * g * tau * tau
+                t, vy, state = hop, -680.0, 1
+        tau = t1 - t
+        y += vy * tau + 0.5 * g * tau * tau
+        vy += g * tau
+    elif kind == "spiker":
+        period = 1.8
+        state = 1 if ((t1 % period) / period) > 0.62 else 0
+    return x, y, vx, vy, t1, state
+
+
+def advance_enemy(enemy: Enemy, elapsed: float, world_bounds_x: tuple[int, int]) -> None:
+    enemy.x, enemy.y, enemy.vx, enemy.vy, enemy.t, enemy.state = advance_state(
+        enemy.kind,
+        enemy.x,
+        enemy.y,
+        enemy.rect.w,
+        enemy.vx,
+        enemy.vy,
+        enemy.t,
+        enemy.state,
+        elapsed,
+        world_bounds_x,
+    )
+    enemy.rect.set_pos(math.floor(enemy.x), math.floor(enemy.y))
+
+
+def lod_steps(distance: float, seq: int, frame: int) -> bool:
+    """Whether an enemy `distance` px outside the visible band is stepped on `frame`."""
+    if distance <= LOD_FULL_PX:
+        return True
+    if distance <= LOD_REDUCED_PX:
+        return (seq + frame) % LOD_REDUCED_EVERY == 0
+    return False
+
+
+def _new_enemy() -> Enemy:
+    return Enemy(kind="walker", rect=Rect(0, 0, 0, 0), vx=0.0, vy=0.0)
+
+
+def _enemy_dead(enemy: Enemy) -> bool:
+    return not enemy.alive
+
+
+class EnemyList:
+    """Pure-Python enemy container, used when NumPy is unavailable (see `EnemyStore`)."""
+
+    def __init__(self) -> None:
+        self._pool: Pool[Enemy] = Pool(_new_enemy, Enemy.reset)
+        self._grid: SpatialHash[Enemy] = SpatialHash()
+        self._enemies: YOrderedDeque[Enemy] = YOrderedDeque(_enemy_dead, on_remove=self._release)
+        self._frame = 0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._enemies)
+
+    def __iter__(self) -> Iterator[Enemy]:
+        return iter(self._enemies)
+
+    def clear(self) -> None:
+        self._enemies.clear()
+        self._grid.clear()
+        self._frame = 0
+        self._seq = 0
+
+    def _release(self, enemy: Enemy) -> None:
+        self._grid.remove(enemy)
+        self._pool.release(enemy)
+
+    def spawn(self, kind: str, x: int, y: int) -> Enemy:
+        enemy = self._pool.acquire(kind, x, y)
+        enemy.seq = self._seq
+        enemy.lod_frame = self._frame
+        self._seq += 1
+        self._enemies.append(enemy)
+        self._grid.insert(enemy)
+        return enemy
+
+    def stats(self) -> dict[str, int]:
+        return self._pool.stats()
+
+    def kill(self, enemy: Enemy) -> None:
+        enemy.alive = False
+        self._grid.remove(enemy)
+        self._enemies.discard(enemy)
+
+    def shift_y(self, dy: int) -> None:
+        for e in self._enemies:
+            e.y += dy
+            e.prev_y += dy
+            e.rect.set_pos(math.floor(e.x), math.floor(e.y))
+        self._grid.rebuild()
+
+    def overlapping_swept(self, rect: Rect, dx: int, dy: int) -> list[Enemy]:
+        """Live enemies overlapping `rect` swept by (dx, dy), in spawn order."""
+        return self._grid.query_swept(rect, dx, dy)
+
+    def update(
+        self,
+        dt: float,
+        world_bounds_x: tuple[int, int],
+        view_y: tuple[float, float] | None = None,
+        cull_y: float | None = None,
+    ) -> None:
+        """Step every enemy and drop those at/below `cull_y`."""
+        self._frame += 1
+        frame = self._frame
+        grid = self._grid
+        for e in self._enemies:
+            e.prev_x = e.x
+            e.prev_y = e.y
+            r = e.rect
+            if view_y is None or lod_steps(max(view_y[0] - r.bottom, r.y - view_y[1], 0), e.seq, frame):
+                elapsed = (frame - e.lod_frame) * dt
+                e.lod_frame = frame
+                if elapsed > LOD_ANALYTIC_S:
+                    advance_enemy(e, elapsed, world_bounds_x)
+                else:
+                    update_enemy_behavior(e, elapsed, world_bounds_x=world_bounds_x)
+                    e.update(elapsed)
+                grid.update(e)
+            if cull_y is not None and r.y >= cull_y:
+                self.kill(e)
+        if cull_y is not None:
+            self._enemies.cull_below(cull_y)
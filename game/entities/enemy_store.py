@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from game.entities.enemy import (
+    ENEMY_SPECS,
+    LOD_ANALYTIC_S,
+    LOD_FULL_PX,
+    LOD_REDUCED_EVERY,
+    LOD_REDUCED_PX,
+    Enemy,
+    EnemyList,
+    advance_state,
+)
+from game.geom import Rect
+from game.np_compat import np
+from game.spatial import SpatialHash
+
+KINDS: tuple[str, ...] = ("walker", "flyer", "jumper", "spiker", "giant")
+_KIND_CODE = {k: i for i, k in enumerate(KINDS)}
+WALKER, FLYER, JUMPER, SPIKER, GIANT = range(len(KINDS))
+_FREE = -1
+
+# The store's parallel arrays and their dtypes (see `EnemyStore`).
+_FIELDS: tuple[tuple[str, str], ...] = (
+    ("kind", "int8"),
+    ("x", "float64"),
+    ("y", "float64"),
+    ("prev_x", "float64"),
+    ("prev_y", "float64"),
+    ("rx", "int64"),
+    ("ry", "int64"),
+    ("w", "int64"),
+    ("h", "int64"),
+    ("vx", "float64"),
+    ("vy", "float64"),
+    ("t", "float64"),
+    ("state", "int8"),
+    ("alive", "bool"),
+    ("can_stomp", "bool"),
+    ("seq", "int64"),
+    ("lod_frame", "int64"),
+    ("gx0", "int64"),
+    ("gy0", "int64"),
+    ("gx1", "int64"),
+    ("gy1", "int64"),
+)
+# Per-slot scratch arrays for `update()`, so a step allocates no temporaries.
+_SCRATCH: tuple[tuple[str, str], ...] = (
+    ("_step", "bool"),
+    ("_out", "bool"),
+    ("_m", "bool"),
+    ("_m2", "bool"),
+    ("_el", "float64"),
+    ("_f", "float64"),
+    ("_f2", "float64"),
+    ("_k", "int64"),
+)
+
+
+class EnemyView:
+    """
+    Enemy-shaped adapter over one EnemyStore slot, so `Enemy.draw` and the collision
+    code keep working unchanged. Views are cached per slot; don't hold one across
+    frames (a killed enemy's slot is recycled by the next spawn).
+    """
+
+    __slots__ = ("_store", "_i", "_rect")
+
+    def __init__(self, store: EnemyStore, i: int) -> None:
+        self._store = store
+        self._i = i
+        self._rect = Rect(0, 0, 0, 0)
+
+    @property
+    def kind(self) -> str:
+        code = int(self._store.kind[self._i])
+        if code == _FREE:
+            raise RuntimeError("EnemyView of a killed enemy")
+        return KINDS[code]
+
+    @property
+    def rect(self) -> Rect:
+        s = self._store
+        i = self._i
+        r = self._rect
+        r.update(int(s.rx[i]), int(s.ry[i]), int(s.w[i]), int(s.h[i]))
+        return r
+
+    @property
+    def x(self) -> float:
+        return float(self._store.x[self._i])
+
+    @property
+    def y(self) -> float:
+        return float(self._store.y[self._i])
+
+    @property
+    def prev_x(self) -> float:
+        return float(self._store.prev_x[self._i])
+
+    @property
+    def prev_y(self) -> float:
+        return float(self._store.prev_y[self._i])
+
+    @property
+    def vx(self) -> float:
+        return float(self._store.vx[self._i])
+
+    @vx.setter
+    def vx(self, value: float) -> None:
+        self._store.vx[self._i] = value
+
+    @property
+    def vy(self) -> float:
+        return float(self._store.vy[self._i])
+
+    @vy.setter
+    def vy(self, value: float) -> None:
+        self._store.vy[self._i] = value
+
+    @property
+    def t(self) -> float:
+        return float(self._store.t[self._i])
+
+    @property
+    def state(self) -> int:
+        return int(self._store.state[self._i])
+
+    @property
+    def can_stomp(self) -> bool:
+        return bool(self._store.can_stomp[self._i])
+
+    @property
+    def alive(self) -> bool:
+        return bool(self._store.alive[self._i])
+
+    @alive.setter
+    def alive(self, value: bool) -> None:
+        if not value:
+            self._store.kill(self)
+
+    draw = Enemy.draw
+
+
+class EnemyStore:
+    """
+    Structure-of-arrays enemy container: kind, position, size, velocity, `t`, state
+    and alive flags live in parallel NumPy arrays, and `update()` runs each kind's
+    behaviour (see `update_enemy_behavior`) as masked vector operations.
+
+    `x`/`y` are exact float positions; `rx`/`ry` are the integer rect origin derived
+    from them after each move, used for collision, culling and drawing.
+
+    Free slots keep kind=-1 and zero velocity so the motion step can run over the
+    whole used range without masking. Slots are recycled through a free list (the
+    store's pool: `stats()` reports reuse); `seq` keeps spawn order for deterministic
+    iteration and contact ordering. `update()` applies the same activity LOD as
+    `EnemyList`. Collision queries go through a SpatialHash of the slot views, which
+    `update()` re-buckets only for slots whose covered cells changed.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if np is None:
+            raise RuntimeError("EnemyStore requires NumPy; use make_enemy_store() for a fallback")
+        self._alloc(max(1, int(capacity)))
+        self._n = 0
+        self._free: list[int] = []
+        self._seq = 0
+        self._views: list[EnemyView] = []
+        self._grid: SpatialHash[EnemyView] = SpatialHash()
+        self._frame = 0
+        self.high_water = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        # The grid holds this store's own views: rebuilt on load, once the arrays are back.
+        state = self.__dict__.copy()
+        del state["_grid"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._grid = SpatialHash()
+        for view in self:
+            self._grid.insert(view)
+
+    def _alloc(self, cap: int) -> None:
+        for name, dtype in _FIELDS + _SCRATCH:
+            setattr(self, name, np.zeros(cap, dtype=dtype))
+        self.kind.fill(_FREE)
+
+    def _grow(self) -> None:
+        old = {name: getattr(self, name) for name, _ in _FIELDS}
+        self._alloc(len(self.kind) * 2)
+        for name, arr in old.items():
+            getattr(self, name)[: len(arr)] = arr
+
+    def __len__(self) -> int:
+        return self._n - len(self._free)
+
+    def __iter__(self) -> Iterator[EnemyView]:
+        idx = np.flatnonzero(self.alive[: self._n])
+        if len(idx) > 1:
+            idx = idx[np.argsort(self.seq[idx], kind="stable")]
+        views = self._views
+        for i in idx.tolist():
+            yield views[i]
+
+    def clear(self) -> None:
+        n = self._n
+        self.kind[:n] = _FREE
+        self.vx[:n] = 0.0
+        self.vy[:n] = 0.0
+        self.alive[:n] = False
+        self._n = 0
+        self._free.clear()
+        self._grid.clear()
+        self._seq = 0
+        self._frame = 0
+
+    def spawn(self, kind: str, x: int, y: int) -> EnemyView:
+        if self._free:
+            i = self._free.pop()
+            self.hits += 1
+        else:
+            if self._n == len(self.kind):
+                self._grow()
+            i = self._n
+            self._n += 1
+            self.misses += 1
+            if i == len(self._views):
+                self._views.append(EnemyView(self, i))
+        w, h, vx, vy, can_stomp = ENEMY_SPECS[kind]
+        self.kind[i] = _KIND_CODE[kind]
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.rx[i] = x
+        self.ry[i] = y
+        self.w[i] = w
+        self.h[i] = h
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.t[i] = 0.0
+        self.state[i] = 0
+        self.alive[i] = True
+        self.can_stomp[i] = can_stomp
+        self.seq[i] = self._seq
+        self.lod_frame[i] = self._frame
+        self._seq += 1
+        cs = self._grid.cell_size
+        self.gx0[i] = x // cs
+        self.gy0[i] = y // cs
+        self.gx1[i] = (x + w - 1) // cs
+        self.gy1[i] = (y + h - 1) // cs
+        self._grid.insert(self._views[i])
+        live = len(self)
+        if live > self.high_water:
+            self.high_water = live
+        return self._views[i]
+
+    def stats(self) -> dict[str, int]:
+        """Slot reuse counters, in the same shape as `Pool.stats()`."""
+        return {
+            "live": len(self),
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def kill(self, enemy: EnemyView) -> None:
+        i = enemy._i
+        if not self.alive[i]:
+            return
+        self.alive[i] = False
+        self.kind[i] = _FREE
+        self.vx[i] = 0.0
+        self.vy[i] = 0.0
+        self._free.append(i)
+        self._grid.remove(enemy)
+
+    def _cull_below(self, cutoff_y: float) -> None:
+        n = self._n
+        m = self._m[:n]
+        np.greater_equal(self.ry[:n], cutoff_y, out=m)
+        m &= self.alive[:n]
+        if not m.any():
+            return
+        idx = np.flatnonzero(m)
+        self.alive[idx] = False
+        self.kind[idx] = _FREE
+        self.vx[idx] = 0.0
+        self.vy[idx] = 0.0
+        views = self._views
+        grid = self._grid
+        for i in idx.tolist():
+            self._free.append(i)
+            grid.remove(views[i])
+
+    def _rebucket(self, n: int) -> None:
+        # Cells only change when an enemy crosses a grid line, so only those few
+        # slots go back through the (per-object) SpatialHash.
+        cs = self._grid.cell_size
+        cell = self._k[:n]
+        same = self._m2[:n]
+        moved = self._m[:n]
+        moved.fill(False)
+        for old, pos, size in (
+            (self.gx0, self.rx, None),
+            (self.gy0, self.ry, None),
+            (self.gx1, self.rx, self.w),
+            (self.gy1, self.ry, self.h),
+        ):
+            if size is None:
+                np.floor_divide(pos[:n], cs, out=cell)
+            else:
+                np.add(pos[:n], size[:n], out=cell)
+                cell -= 1
+                cell //= cs
+            old = old[:n]
+            np.not_equal(old, cell, out=same)
+            moved |= same
+            old[:] = cell
+        moved &= self.alive[:n]
+        if not moved.any():
+            return
+        views = self._views
+        grid = self._grid
+        for i in np.flatnonzero(moved).tolist():
+            grid.update(views[i])
+
+    def shift_y(self, dy: int) -> None:
+        """Move every enemy by `dy` (world rebasing)."""
+        n = self._n
+        self.y[:n] += dy
+        self.prev_y[:n] += dy
+        self.ry[:n] = np.floor(self.y[:n]).astype(np.int64)
+        self._rebucket(n)
+
+    def overlapping_swept(self, rect: Rect, dx: int, dy: int) -> list[EnemyView]:
+        """Live enemies overlapping the box swept by `rect` moving by (dx, dy), in spawn order."""
+        return self._grid.query_swept(rect, dx, dy)
+
+    def update(
+        self,
+        dt: float,
+        world_bounds_x: tuple[int, int],
+        view_y: tuple[float, float] | None = None,
+        cull_y: float | None = None,
+    ) -> None:
+        """Step every enemy, then free the slots of those at/below `cull_y` (behind the camera)."""
+        n = self._n
+        self._frame += 1
+        if n == 0:
+            return
+        frame = self._frame
+        left_x, right_x = world_bounds_x
+        kind = self.kind[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        w = self.w[:n]
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        t = self.t[:n]
+        state = self.state[:n]
+        lod_frame = self.lod_frame[:n]
+        # Per-slot scratch (see `_SCRATCH`): every temporary below is computed in place.
+        step = self._step[:n]
+        out = self._out[:n]
+        m = self._m[:n]
+        m2 = self._m2[:n]
+        el = self._el[:n]
+        f = self._f[:n]
+        f2 = self._f2[:n]
+        k = self._k[:n]
+        np.copyto(self.prev_x[:n], x)
+        np.copyto(self.prev_y[:n], y)
+
+        # Activity LOD (see `lod_steps`): which slots step this frame, and by how much.
+        np.copyto(step, self.alive[:n])
+        if view_y is not None:
+            ry = self.ry[:n]
+            np.add(ry, self.h[:n], out=f)
+            np.subtract(view_y[0], f, out=f)
+            np.subtract(ry, view_y[1], out=f2)
+            np.maximum(f, f2, out=f)
+            np.maximum(f, 0, out=f)
+            np.add(self.seq[:n], frame, out=k)
+            k %= LOD_REDUCED_EVERY
+            np.equal(k, 0, out=m2)
+            np.less_equal(f, LOD_REDUCED_PX, out=m)
+            m &= m2
+            np.less_equal(f, LOD_FULL_PX, out=m2)
+            m |= m2
+            step &= m
+        np.subtract(frame, lod_frame, out=el)
+        el *= dt
+        el *= step
+        np.copyto(lod_frame, frame, where=step)
+
+        wake = m
+        np.greater(el, LOD_ANALYTIC_S, out=wake)
+        wake &= step
+        if wake.any():
+            for i in np.flatnonzero(wake).tolist():
+                x[i], y[i], vx[i], vy[i], t[i], state[i] = advance_state(
+                    KINDS[int(kind[i])],
+                    float(x[i]),
+                    float(y[i]),
+                    int(w[i]),
+                    float(vx[i]),
+                    float(vy[i]),
+                    float(t[i]),
+                    int(state[i]),
+                    float(el[i]),
+                    world_bounds_x,
+                )
+            np.copyto(el, 0.0, where=wake)
+            step ^= wake
+
+        np.less(x, left_x, out=out)
+        np.add(x, w, out=f)
+        np.greater(f, right_x, out=m)
+        out |= m
+        out &= step
+
+        # walker / giant: bounce off the world edges and clamp back inside.
+        np.equal(kind, WALKER, out=m)
+        np.equal(kind, GIANT, out=m2)
+        m |= m2
+        m &= out
+        if m.any():
+            np.negative(vx, out=vx, where=m)
+            np.subtract(right_x, w, out=f)
+            np.minimum(x, f, out=f)
+            np.maximum(f, left_x, out=f)
+            np.copyto(x, f, where=m)
+
+        # flyer: sine bob, bounce without clamping, speed cap.
+        np.equal(kind, FLYER, out=m)
+        m &= step
+        if m.any():
+            np.multiply(t, 2.3, out=f)
+            np.sin(f, out=f)
+            f *= 70.0
+            np.copyto(vy, f, where=m)
+            np.logical_and(m, out, out=m2)
+            np.negative(vx, out=vx, where=m2)
+            np.clip(vx, -150.0, 150.0, out=f)
+            np.copyto(vx, f, where=m)
+
+        # jumper: single hop when `t` crosses an integer second, then gravity.
+        np.equal(kind, JUMPER, out=m)
+        m &= step
+        if m.any():
+            np.floor(t, out=f)
+            np.subtract(t, f, out=f)
+            np.less(f, el, out=m2)
+            m2 &= m
+            np.equal(state, 0, out=out)
+            m2 &= out
+            np.copyto(state, 1, where=m2)
+            np.copyto(vy, -680.0, where=m2)
+            np.multiply(el, 1800.0, out=f)
+            np.add(vy, f, out=vy, where=m)
+
+        # spiker: spikes out during the last part of each period.
+        np.equal(kind, SPIKER, out=m)
+        m &= step
+        if m.any():
+            period = 1.8
+            np.remainder(t, period, out=f)
+            f /= period
+            np.greater(f, 0.62, out=m2)
+            np.copyto(state, m2, where=m)
+
+        # Motion (Enemy.update): exact positions, rect origin floored.
+        # Slots that don't step have el == 0 and stay put.
+        t += el
+        np.multiply(vx, el, out=f)
+        x += f
+        np.multiply(vy, el, out=f)
+        y += f
+        np.floor(x, out=f)
+        np.copyto(self.rx[:n], f, casting="unsafe")
+        np.floor(y, out=f)
+        np.copyto(self.ry[:n], f, casting="unsafe")
+        if cull_y is not None:
+            self._cull_below(cull_y)
+        self._rebucket(n)
+
+
+def make_enemy_store() -> EnemyStore | EnemyList:
+    """Array-backed store when NumPy is available, otherwise the pure-Python list."""
+    if np is None:
+        return EnemyList()
+    return EnemyStore()
@@ -2,10 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-import pyxel
-
 from game.geom import Rect
-from game.pixel_art import item_sprite
 
 
 @dataclass
@@ -14,9 +11,18 @@ class Item:
     rect: Rect
     taken: bool = False
 
+    def reset(self, kind: str, x: int, y: int, w: int, h: int) -> None:
+        self.kind = kind
+        self.rect.update(x, y, w, h)
+        self.taken = False
+
     def draw(self, cam_x: float, cam_y: float, color: int) -> None:
         if self.taken:
             return
+        import pyxel
+
+        from game.pixel_art import item_sprite
+
         r = self.rect
         x = int(r.x - cam_x)
         y = int(r.y - cam_y)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import Generic, TypeVar
+
+from game.spatial import HasRect
+
+T = TypeVar("T", bound=HasRect)
+
+
+class YOrderedDeque(Generic[T]):
+    """
+    Entities kept in spawn order, which is (roughly) decreasing world y: the front of
+    the deque is the bottom of the tower.
+
+    - `cull_below()` pops from the front while entities are behind the camera, O(1) each.
+    - Removed-in-place entities (collected items, dead enemies) become tombstones: the
+      owner flags them (`is_dead`) and calls `discard()`. Iteration skips them, and the
+      deque is only compacted once tombstones exceed `compact_ratio` of its length.
+
+    Nothing is copied on frames where nothing was removed. `on_remove` is called for
+    every entity as it physically leaves (cull, compaction, clear), e.g. to return it
+    to a Pool.
+    """
+
+    def __init__(
+        self,
+        is_dead: Callable[[T], bool],
+        *,
+        on_remove: Callable[[T], None] | None = None,
+        compact_min: int = 16,
+        compact_ratio: float = 0.25,
+    ) -> None:
+        self._is_dead = is_dead
+        self._on_remove = on_remove
+        self._q: deque[T] = deque()
+        self._tombstones = 0
+        self._compact_min = compact_min
+        self._compact_ratio = compact_ratio
+
+    def __len__(self) -> int:
+        return len(self._q) - self._tombstones
+
+    def __iter__(self) -> Iterator[T]:
+        is_dead = self._is_dead
+        for obj in self._q:
+            if not is_dead(obj):
+                yield obj
+
+    def clear(self) -> None:
+        if self._on_remove is not None:
+            for obj in self._q:
+                self._on_remove(obj)
+        self._q.clear()
+        self._tombstones = 0
+
+    def append(self, obj: T) -> None:
+        self._q.append(obj)
+
+    def discard(self, obj: T) -> None:
+        """Record that `obj` (already flagged dead by its owner) left the container."""
+        self._tombstones += 1
+        n = len(self._q)
+        if self._tombstones >= self._compact_min and self._tombstones > n * self._compact_ratio:
+            self.compact()
+
+    def compact(self) -> None:
+        is_dead = self._is_dead
+        on_remove = self._on_remove
+        keep: deque[T] = deque()
+        for obj in self._q:
+            if not is_dead(obj):
+                keep.append(obj)
+            elif on_remove is not None:
+                on_remove(obj)
+        self._q = keep
+        self._tombstones = 0
+
+    def cull_below(self, cutoff_y: float) -> None:
+        """Pop entities from the bottom while they are dead or at/below `cutoff_y`."""
+        q = self._q
+        is_dead = self._is_dead
+        on_remove = self._on_remove
+        while q:
+            obj = q[0]
+            if is_dead(obj):
+                self._tombstones -= 1
+            elif obj.rect.y < cutoff_y:
+                break
+            q.popleft()
+            if on_remove is not None:
+                on_remove(obj)
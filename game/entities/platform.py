@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 
-import pyxel
-
 from game.geom import Rect
-from game.pixel_art import platform_tile
 
 
 @dataclass
 class Platform:
     rect: Rect
 
+    def reset(self, x: int, y: int, w: int, h: int) -> None:
+        self.rect.update(x, y, w, h)
+
     def draw(self, cam_x: float, cam_y: float, color: int) -> None:
+        import pyxel
+
+        from game.pixel_art import platform_tile
+
         r = self.rect
         x = int(r.x - cam_x)
         y = int(r.y - cam_y)
@@ -21,3 +27,82 @@ class Platform:
         for yy in range(y, y + r.h, ts):
             for xx in range(x, x + r.w, ts):
                 pyxel.blt(xx, yy, tile, 0, 0, ts, ts, colkey=0)
+
+
+class PlatformIndex:
+    """
+    Platforms ordered by top y, lowest (largest y) first.
+
+    `_spawn_more` generates rows with strictly decreasing y, so appends land at the end
+    and culling behind the camera removes from the front. Both are O(1) amortized; the
+    front is dropped lazily via `_head` and compacted once it dominates the list.
+    Range queries on top y are O(log n) via bisect over `_keys` (= -top, ascending).
+    """
+
+    _COMPACT_MIN = 64
+
+    def __init__(self, on_remove: Callable[[Platform], None] | None = None) -> None:
+        self._plats: list[Platform] = []
+        self._keys: list[int] = []
+        self._head = 0
+        self._on_remove = on_remove
+
+    def __len__(self) -> int:
+        return len(self._plats) - self._head
+
+    def __iter__(self) -> Iterator[Platform]:
+        plats = self._plats
+        for i in range(self._head, len(plats)):
+            yield plats[i]
+
+    def clear(self) -> None:
+        if self._on_remove is not None:
+            for p in self:
+                self._on_remove(p)
+        self._plats.clear()
+        self._keys.clear()
+        self._head = 0
+
+    def append(self, plat: Platform) -> None:
+        key = -plat.rect.top
+        if not self._keys or key > self._keys[-1]:
+            self._plats.append(plat)
+            self._keys.append(key)
+            return
+        # Out-of-order insert (not produced by the spawner, but keep the invariant).
+        i = bisect_right(self._keys, key, self._head)
+        self._keys.insert(i, key)
+        self._plats.insert(i, plat)
+
+    def shift_y(self, dy: int) -> None:
+        """Move every platform by `dy` (world rebasing); order is unchanged."""
+        plats = self._plats
+        keys = self._keys
+        for i in range(self._head, len(plats)):
+            plats[i].rect.move_ip(0, dy)
+            keys[i] -= dy
+
+    def cull_below(self, cutoff_y: float) -> None:
+        """Drop platforms whose y is at or below `cutoff_y` (behind the camera)."""
+        plats = self._plats
+        n = len(plats)
+        head = self._head
+        on_remove = self._on_remove
+        while head < n and plats[head].rect.y >= cutoff_y:
+            if on_remove is not None:
+                on_remove(plats[head])
+            head += 1
+        self._head = head
+        if head >= self._COMPACT_MIN and head * 2 >= n:
+            del plats[:head]
+            del self._keys[:head]
+            self._head = 0
+
+    def tops_between(self, top_min: float, top_max: float) -> Iterator[Platform]:
+        """Platforms with `top_min <= rect.top <= top_max`, highest (smallest top) first."""
+        keys = self._keys
+        plats = self._plats
+        i = bisect_left(keys, -top_max, self._head)
+        j = bisect_right(keys, -top_min, i)
+        for k in range(j - 1, i - 1, -1):
+            yield plats[k]
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
-import pyxel
+import math
+from dataclasses import dataclass, field
 
 from game.constants import (
     INVULN_SECONDS_ON_HIT,
@@ -16,7 +15,6 @@ from game.constants import (
     PLAYER_X_FRICTION,
 )
 from game.geom import Rect
-from game.sprites import SPR_H, SPR_W, character_sprite
 from game.util import clamp, lerp
 
 
@@ -43,8 +41,13 @@ class Player:
     phase: float = 0.0
     invuln_item: float = 0.0
 
+    _rect: Rect = field(default_factory=lambda: Rect(0, 0, PLAYER_W, PLAYER_H), init=False, repr=False, compare=False)
+
     def rect(self) -> Rect:
-        return Rect(int(self.x), int(self.y), PLAYER_W, PLAYER_H)
+        """The player's integer box. Updated in place: copy it if you need it to persist."""
+        r = self._rect
+        r.set_pos(math.floor(self.x), math.floor(self.y))
+        return r
 
     def is_invulnerable(self) -> bool:
         return self.invuln > 0.0 or self.invuln_item > 0.0
@@ -121,6 +124,10 @@ class Player:
         mouth_style: str,
         hat_style: str,
     ) -> None:
+        import pyxel
+
+        from game.sprites import SPR_H, SPR_W, character_sprite
+
         r = self.rect()
         x = int(r.x - cam_x)
         y = int(r.y - cam_y)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass
+
+from game.bot import HeuristicBot
+from game.character import CharacterSpec
+from game.config import GameConfig
+from game.constants import SIM_HZ
+from game.replay import config_hash
+from game.theme import build_theme
+from game.world import PlayWorld
+from game.zones import ZONES, zone_for_floor
+
+PERCENTILES: tuple[int, ...] = (10, 25, 50, 75, 90, 99)
+
+
+@dataclass(frozen=True)
+class FarmTask:
+    """One bot run: `prompt` picks the theme, `seed` the layout and the character."""
+
+    run_id: str
+    prompt: str
+    seed: int
+
+
+def run_seed(prompt: str, k: int) -> int:
+    """The k-th seed for `prompt`: run 0 is the prompt's own theme seed (what players get)."""
+    if k == 0:
+        return build_theme(prompt).seed
+    digest = hashlib.sha256(f"{prompt}/{k}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=False)
+
+
+def make_tasks(prompts: list[str], runs: int) -> list[FarmTask]:
+    """`runs` tasks spread round-robin over `prompts`; ids are stable across invocations."""
+    tasks: list[FarmTask] = []
+    for i in range(max(0, int(runs))):
+        prompt = prompts[i % len(prompts)]
+        k = i // len(prompts)
+        tasks.append(FarmTask(run_id=f"{prompt}#{k}", prompt=prompt, seed=run_seed(prompt, k)))
+    return tasks
+
+
+def simulate(task: FarmTask, cfg: GameConfig, frames: int) -> dict:
+    """Play one run with the heuristic bot; returns a JSON-friendly result row."""
+    theme = build_theme(task.prompt)
+    world = PlayWorld(cfg)
+    world.reset(seed=task.seed, character=CharacterSpec.from_seed(task.seed))
+    bot = HeuristicBot()
+    dt = 1.0 / SIM_HZ
+    # zone_times[i]: game time at which zone i was first entered.
+    zone_times = [0.0]
+    t0 = time.perf_counter()
+    for _ in range(max(0, int(frames))):
+        for ev in world.step(dt, bot(world)):
+            if ev.kind == "zone_change":
+                while len(zone_times) <= ev.value:
+                    zone_times.append(round(world.time, 3))
+        if world.over:
+            break
+    return {
+        "id": task.run_id,
+        "prompt": theme.prompt,
+        "seed": task.seed,
+        "config_hash": config_hash(cfg),
+        "frame_limit": int(frames),
+        "floor": world.floor,
+        "reason": world.reason if world.over else "timeout",
+        "frames": world.frame,
+        "sim_seconds": round(world.time, 3),
+        "zone_times": zone_times,
+        "wall_seconds": round(time.perf_counter() - t0, 4),
+    }
+
+
+def read_results(path: str, cfg_hash: str | None = None, frame_limit: int | None = None) -> list[dict]:
+    """Rows already in `path`, optionally only those for this config hash and frame limit."""
+    rows: list[dict] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if cfg_hash is not None and row.get("config_hash") != cfg_hash:
+                    continue
+                if frame_limit is not None and row.get("frame_limit") != frame_limit:
+                    continue
+                rows.append(row)
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def _task_rows(rows: list[dict], tasks: list[FarmTask]) -> list[dict]:
+    """The rows belonging to `tasks`, one per task id (the last one wins)."""
+    ids = {t.run_id for t in tasks}
+    return list({row["id"]: row for row in rows if row["id"] in ids}.values())
+
+
+def pool_imap(fn: Callable, jobs: Iterable[tuple], workers: int | None = None) -> Iterator[tuple[tuple, object]]:
+    """Yield `(args, fn(*args))` as jobs finish, keeping ~2 per worker in flight."""
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    pending = iter(jobs)
+    in_flight: dict[Future, tuple] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            while True:
+                while len(in_flight) < workers * 2:
+                    args = next(pending, None)
+                    if args is None:
+                        break
+                    in_flight[pool.submit(fn, *args)] = args
+                if not in_flight:
+                    return
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    yield in_flight.pop(fut), fut.result()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def run_farm(
+    tasks: list[FarmTask],
+    *,
+    out_path: str,
+    cfg: GameConfig | None = None,
+    frames: int = 36000,
+    workers: int | None = None,
+    progress=None,
+) -> list[dict]:
+    """Run `tasks`, appending rows to `out_path`; rows already there are reused (resume)."""
+    cfg = cfg or GameConfig.load()
+    rows = _task_rows(read_results(out_path, config_hash(cfg), int(frames)), tasks)
+    done = {row["id"] for row in rows}
+    todo = [t for t in tasks if t.run_id not in done]
+    if not todo:
+        return rows
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    jobs = pool_imap(simulate, ((t, cfg, frames) for t in todo), workers)
+    with open(out_path, "a", encoding="utf-8") as out, closing(jobs):
+        for _, row in jobs:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            rows.append(row)
+            if progress is not None:
+                progress(len(rows), len(tasks), row)
+    return rows
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float | None:
+    """Linear-interpolated percentile (q in 0..100) of an ascending list."""
+    if not sorted_vals:
+        return None
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return round(sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo), 3)
+
+
+def _percentiles(vals: list[float]) -> dict[str, float | None]:
+    vals = sorted(vals)
+    return {f"p{q}": _percentile(vals, q) for q in PERCENTILES}
+
+
+def summarize(rows: list[dict], zone_floor_step: int) -> dict:
+    """Per zone: survival, arrival time percentiles, and end reasons/floors of runs ending there."""
+    total = len(rows)
+    zones: list[dict] = []
+    for zone in ZONES:
+        reached = [r for r in rows if len(r["zone_times"]) > zone.index]
+        if not reached:
+            break
+        ended = [r for r in rows if zone_for_floor(r["floor"], step=zone_floor_step).index == zone.index]
+        reasons: dict[str, int] = {}
+        for r in ended:
+            reasons[r["reason"]] = reasons.get(r["reason"], 0) + 1
+        zones.append(
+            {
+                "zone": zone.index,
+                "name": zone.name_en,
+                "reached": len(reached),
+                "survival": round(len(reached) / total, 4),
+                "time_to_reach": _percentiles([r["zone_times"][zone.index] for r in reached]),
+                "ended": len(ended),
+                "reasons": dict(sorted(reasons.items())),
+                "final_floor": _percentiles([r["floor"] for r in ended]),
+            }
+        )
+    reasons: dict[str, int] = {}
+    for r in rows:
+        reasons[r["reason"]] = reasons.get(r["reason"], 0) + 1
+    return {
+        "runs": total,
+        "floor": _percentiles([r["floor"] for r in rows]),
+        "sim_seconds": _percentiles([r["sim_seconds"] for r in rows]),
+        "reasons": dict(sorted(reasons.items())),
+        "zones": zones,
+        "cpu_seconds": round(sum(r["wall_seconds"] for r in rows), 3),
+    }
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--runs", type=int, default=1000, help="number of bot runs (default: 1000)")
+    ap.add_argument("--prompts", default="default", help="comma-separated theme prompts, used round-robin")
+    ap.add_argument("--frames", type=int, default=36000, help="max simulation steps per run")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--out", default=os.path.join("save", "farm", "runs.jsonl"), help="result rows (JSON lines)")
+    ap.add_argument("--fresh", action="store_true", help="discard existing results instead of resuming")
+    ap.add_argument("--report-only", action="store_true", help="only aggregate the rows already in --out")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m game --farm", description="Run many headless bot runs in parallel.")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    cfg = GameConfig.load()
+    prompts = [p.strip() for p in args.prompts.split(",") if p.strip()] or ["default"]
+    if args.fresh and not args.report_only and os.path.exists(args.out):
+        os.remove(args.out)
+
+    t0 = time.perf_counter()
+    tasks = make_tasks(prompts, args.runs)
+    if args.report_only:
+        rows = _task_rows(read_results(args.out, config_hash(cfg), args.frames), tasks)
+    else:
+
+        def progress(done: int, total: int, row: dict) -> None:
+            sys.stderr.write(f"\r{done}/{total} {row['id']}: floor {row['floor']} ({row['reason']})\033[K")
+            sys.stderr.flush()
+
+        try:
+            rows = run_farm(
+                tasks,
+                out_path=args.out,
+                cfg=cfg,
+                frames=args.frames,
+                workers=args.workers,
+                progress=progress,
+            )
+        except KeyboardInterrupt:
+            sys.stderr.write(f"\ninterrupted; rerun the same command to resume from {args.out}\n")
+            return 130
+        sys.stderr.write("\n")
+    report = summarize(rows, cfg.zone_floor_step)
+    wall = time.perf_counter() - t0
+    report["wall_seconds"] = round(wall, 3)
+    json.dump(report, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
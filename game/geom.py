@@ -1,51 +1,124 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 
-
-@dataclass
 class Rect:
-    x: int
-    y: int
-    w: int
-    h: int
+    """
+    Integer axis-aligned box with half-open right/bottom edges.
+
+    Bounds (right/bottom/centerx/centery) are read-only, cached and refreshed whenever
+    x/y/w/h change. Use the in-place mutators (`set_pos`, `move_ip`, `update`,
+    `copy_from`) to avoid allocating.
+    """
+
+    __slots__ = ("_x", "_y", "_w", "_h", "_right", "_bottom", "_centerx", "_centery")
+
+    def __init__(self, x: int, y: int, w: int, h: int) -> None:
+        self.update(x, y, w, h)
+
+    def update(self, x: int, y: int, w: int, h: int) -> None:
+        self._x = x
+        self._y = y
+        self._w = w
+        self._h = h
+        self._right = x + w
+        self._bottom = y + h
+        self._centerx = x + w // 2
+        self._centery = y + h // 2
+
+    def set_pos(self, x: int, y: int) -> None:
+        w = self._w
+        h = self._h
+        self._x = x
+        self._y = y
+        self._right = x + w
+        self._bottom = y + h
+        self._centerx = x + w // 2
+        self._centery = y + h // 2
+
+    def move_ip(self, dx: int, dy: int) -> None:
+        self.set_pos(self._x + dx, self._y + dy)
+
+    def copy_from(self, other: "Rect") -> None:
+        self.update(other._x, other._y, other._w, other._h)
 
     @property
-    def left(self) -> int:
-        return self.x
+    def x(self) -> int:
+        return self._x
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self.set_pos(value, self._y)
 
     @property
-    def right(self) -> int:
-        return self.x + self.w
+    def y(self) -> int:
+        return self._y
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self.set_pos(self._x, value)
+
+    @property
+    def w(self) -> int:
+        return self._w
+
+    @w.setter
+    def w(self, value: int) -> None:
+        self.update(self._x, self._y, value, self._h)
+
+    @property
+    def h(self) -> int:
+        return self._h
+
+    @h.setter
+    def h(self, value: int) -> None:
+        self.update(self._x, self._y, self._w, value)
+
+    @property
+    def left(self) -> int:
+        return self._x
 
     @property
     def top(self) -> int:
-        return self.y
+        return self._y
+
+    @property
+    def right(self) -> int:
+        return self._right
 
     @property
     def bottom(self) -> int:
-        return self.y + self.h
+        return self._bottom
 
     @property
     def centerx(self) -> int:
-        return self.x + self.w // 2
+        return self._centerx
 
     @property
     def centery(self) -> int:
-        return self.y + self.h // 2
+        return self._centery
 
     @property
     def center(self) -> tuple[int, int]:
-        return self.centerx, self.centery
+        return self._centerx, self._centery
 
     def move(self, dx: int, dy: int) -> "Rect":
-        return Rect(self.x + dx, self.y + dy, self.w, self.h)
+        return Rect(self._x + dx, self._y + dy, self._w, self._h)
 
     def colliderect(self, other: "Rect") -> bool:
         return not (
-            self.right <= other.left
-            or self.left >= other.right
-            or self.bottom <= other.top
-            or self.top >= other.bottom
+            self._right <= other._x
+            or self._x >= other._right
+            or self._bottom <= other._y
+            or self._y >= other._bottom
         )
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Rect):
+            return NotImplemented
+        return self._x == other._x and self._y == other._y and self._w == other._w and self._h == other._h
+
+    __hash__ = None  # type: ignore[assignment]  (mutable)
+
+    def __repr__(self) -> str:
+        return f"Rect(x={self._x}, y={self._y}, w={self._w}, h={self._h})"
+
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import functools
+import json
+import struct
+import sys
+import time
+import zlib
+from collections.abc import Callable
+
+from game.bot import HeuristicBot
+from game.character import CharacterSpec
+from game.config import GameConfig
+from game.constants import PLAYER_H, PLAYER_W, REBASE_FLOORS, SIM_HZ
+from game.entities.enemy import EnemyList
+from game.entities.enemy_store import EnemyStore
+from game.input import InputProvider, InputState
+from game.np_compat import HAS_NUMPY
+from game.replay import Replay, ReplayRecorder, load_replay, verify_replay
+from game.rewind import first_divergence
+from game.theme import build_theme
+from game.world import PlayWorld
+
+_STEP_DIGEST = struct.Struct("<iiqq")
+
+
+def idle_input() -> InputProvider:
+    def poll(_world: PlayWorld) -> InputState:
+        return InputState()
+
+    return poll
+
+
+def hop_input(hold_frames: int = 24) -> InputProvider:
+    """
+    Scripted source: charge for `hold_frames` whenever grounded, release, and steer
+    toward the nearest platform above. Cheap and deterministic; good for soak runs.
+    """
+    held = 0
+    prev_down = False
+
+    def poll(world: PlayWorld) -> InputState:
+        nonlocal held, prev_down
+        p = world.player
+        feet = p.y + PLAYER_H
+        target = None
+        for plat in world.platforms.tops_between(feet - 200, feet - 8):
+            target = plat
+        left = right = False
+        if target is not None:
+            cx = p.x + PLAYER_W / 2
+            left = cx > target.rect.centerx + 12
+            right = cx < target.rect.centerx - 12
+        down = p.grounded and held < hold_frames
+        held = held + 1 if down else 0
+        inp = InputState(
+            left=left,
+            right=right,
+            jump_down=down,
+            jump_pressed=down and not prev_down,
+            jump_released=prev_down and not down,
+        )
+        prev_down = down
+        return inp
+
+    return poll
+
+
+def replay_input(replay: Replay) -> InputProvider:
+    """Play back `replay`'s recorded inputs, one per step (idle once they run out)."""
+    inputs = replay.inputs()
+
+    def poll(_world: PlayWorld) -> InputState:
+        return next(inputs, None) or InputState()
+
+    return poll
+
+
+INPUT_SOURCES: dict[str, Callable[[], InputProvider]] = {
+    "idle": idle_input,
+    "hop": hop_input,
+    "bot": HeuristicBot,
+}
+
+
+def run_headless(
+    *,
+    prompt: str = "default",
+    seed: int | None = None,
+    character: CharacterSpec | None = None,
+    frames: int = 36000,
+    source: InputProvider | None = None,
+    time_scale: float = 1.0,
+    cfg: GameConfig | None = None,
+    profile: bool = True,
+    rebase_floors: int = REBASE_FLOORS,
+    record_path: str | None = None,
+) -> dict:
+    """
+    Step a PlayWorld as fast as possible for `frames` steps or until game over.
+
+    `time_scale` stretches each step's dt (2.0 = twice the game time per step).
+    Returns a JSON-friendly summary: throughput, outcome and per-phase timings, plus
+    `digest`, a CRC of every step's floor, events and player box in absolute
+    (un-rebased) coordinates: two runs with equal digests played out identically.
+    With `record_path`, the run's inputs are also saved there as a replay.
+    """
+    cfg = cfg or GameConfig.load()
+    theme = build_theme(prompt or "default")
+    run_seed = theme.seed if seed is None else int(seed)
+    character = character or CharacterSpec.from_seed(run_seed)
+    world = PlayWorld(cfg)
+    world.reset(seed=run_seed, character=character)
+    world.rebase_floors = max(0, int(rebase_floors))
+    if source is None:
+        source = HeuristicBot()
+    if profile:
+        world.profile = {}
+
+    dt = (1.0 / SIM_HZ) * float(time_scale)
+    recorder = None
+    if record_path:
+        recorder = ReplayRecorder(
+            prompt=theme.prompt, seed=run_seed, character=character, cfg=cfg, dt=dt, rebase_floors=world.rebase_floors
+        )
+    poll_s = 0.0
+    chunk_s = 0.0
+    t0 = time.perf_counter()
+    steps = 0
+    crc = 0
+    for _ in range(max(0, int(frames))):
+        tp = time.perf_counter()
+        inp = source(world)
+        poll_s += time.perf_counter() - tp
+        for ev in world.step(dt, inp):
+            if ev.kind != "rebase":
+                crc = zlib.crc32(f"{ev.kind}:{ev.value};".encode(), crc)
+        # Build chunks ahead the way the single-threaded (web) build does.
+        tp = time.perf_counter()
+        world.chunks.pump()
+        chunk_s += time.perf_counter() - tp
+        r = world.player.rect()
+        crc = zlib.crc32(_STEP_DIGEST.pack(world.frame, world.floor, r.x, r.y - world.origin_y), crc)
+        if recorder is not None:
+            recorder.record(inp, world)
+        steps += 1
+        if world.over:
+            break
+    wall = time.perf_counter() - t0
+    if recorder is not None:
+        with open(record_path, "wb") as f:
+            f.write(recorder.finish(world).to_bytes())
+
+    phases = dict(world.profile or {})
+    phases["input"] = poll_s
+    phases["chunks"] = chunk_s
+    return {
+        "prompt": theme.prompt,
+        "seed": run_seed,
+        "frames": steps,
+        "dt": dt,
+        "sim_seconds": round(world.time, 3),
+        "wall_seconds": round(wall, 4),
+        "fps": round(steps / wall, 1) if wall > 0 else None,
+        "floor": world.floor,
+        "over": world.over,
+        "reason": world.reason if world.over else None,
+        "phases_ms": {k: round(v * 1000.0, 3) for k, v in sorted(phases.items())},
+        "pools": world.pool_stats(),
+        "chunks": world.chunks.stats(),
+        "origin_y": world.origin_y,
+        "digest": f"{crc:08x}",
+    }
+
+
+def bisect_backends(replay: Replay, every: int = 30) -> dict:
+    """
+    Re-simulate `replay` with the NumPy and the pure-Python enemy stores side by side
+    and report the first frame whose state checksums differ (None = identical), e.g.
+    to find why a replay recorded on one build fails to verify on the other.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("--bisect needs NumPy (it compares the NumPy and pure-Python backends)")
+    cfg = dataclasses.replace(GameConfig.load(), **replay.config)
+    worlds: list[PlayWorld] = []
+    for enemies in (EnemyStore(), EnemyList()):
+        world = PlayWorld(cfg)
+        world.enemies = enemies
+        world.reset(seed=replay.seed, character=replay.character)
+        world.rebase_floors = replay.rebase_floors
+        worlds.append(world)
+    frames = replay.frames
+    t0 = time.perf_counter()
+    frame = first_divergence(*worlds, lambda k: replay.input_at(k - 1), frames, replay.dt, every=every)
+    return {
+        "frames": frames,
+        "first_divergence_frame": frame,
+        "numpy_floor": worlds[0].floor,
+        "python_floor": worlds[1].floor,
+        "wall_seconds": round(time.perf_counter() - t0, 4),
+    }
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--frames", type=int, default=36000, help="max simulation steps (default: 36000 = 10 min)")
+    ap.add_argument("--prompt", default="default", help="theme prompt (seeds the level)")
+    ap.add_argument("--seed", type=int, default=None, help="explicit level/character seed (overrides prompt seed)")
+    ap.add_argument(
+        "--input", default="bot", help=f"input source: {', '.join(INPUT_SOURCES)}, or replay:PATH to replay a run"
+    )
+    ap.add_argument("--time-scale", type=float, default=1.0, help="game seconds per real step, relative to 1/SIM_HZ")
+    ap.add_argument("--no-profile", action="store_true", help="skip per-phase timing")
+    ap.add_argument(
+        "--rebase-floors", type=int, default=REBASE_FLOORS, help="floating-origin rebase interval in floors (0 = off)"
+    )
+    ap.add_argument("--record", metavar="PATH", default=None, help="also save the run's inputs as a replay file")
+    ap.add_argument("--replay", metavar="PATH", default=None, help="verify a replay file instead of running")
+    ap.add_argument(
+        "--bisect", metavar="PATH", default=None, help="find the first frame where a replay diverges between backends"
+    )
+    ap.add_argument(
+        "--compare-rebase", action="store_true", help="run with and without rebasing and report whether they match"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m game --headless", description="Run the play simulation without a window."
+    )
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    if args.replay:
+        try:
+            result = verify_replay(load_replay(args.replay))
+        except ValueError as e:
+            ap.error(str(e))
+        json.dump(result, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+    if args.bisect:
+        try:
+            result = bisect_backends(load_replay(args.bisect))
+        except (RuntimeError, ValueError) as e:
+            ap.error(str(e))
+        json.dump(result, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+
+    opts: dict = {"prompt": args.prompt, "seed": args.seed, "frames": args.frames, "time_scale": args.time_scale}
+    if args.input.startswith("replay:"):
+        try:
+            replay = load_replay(args.input.removeprefix("replay:"))
+        except (OSError, ValueError) as e:
+            ap.error(str(e))
+        # Time the recorded run itself: its seed, character, config and step size.
+        factory = functools.partial(replay_input, replay)
+        opts = {
+            "prompt": replay.prompt,
+            "seed": replay.seed,
+            "character": replay.character,
+            "cfg": dataclasses.replace(GameConfig.load(), **replay.config),
+            "frames": min(args.frames, replay.frames),
+            "time_scale": replay.dt * SIM_HZ,
+        }
+    else:
+        factory = INPUT_SOURCES.get(args.input)
+        if factory is None:
+            ap.error(f"unknown input source: {args.input}")
+
+    def run(rebase_floors: int, record_path: str | None) -> dict:
+        return run_headless(
+            **opts,
+            source=factory(),
+            profile=not args.no_profile,
+            rebase_floors=rebase_floors,
+            record_path=record_path,
+        )
+
+    if args.compare_rebase:
+        # Only the primary (rebased) run is recorded.
+        on = run(args.rebase_floors, args.record)
+        off = run(0, None)
+        result = {"identical": on["digest"] == off["digest"], "rebased": on, "fixed_origin": off}
+    else:
+        result = run(args.rebase_floors, args.record)
+    json.dump(result, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
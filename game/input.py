@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
 
-import pyxel
+if TYPE_CHECKING:
+    from game.world import PlayWorld
 
 
 @dataclass
@@ -16,7 +18,20 @@ class InputState:
     back: bool = False
 
 
+class InputProvider(Protocol):
+    """
+    Anything that produces the input for one simulation step from the world state.
+
+    Polled exactly once per `PlayWorld.step`; providers that hold a button must set
+    the `jump_pressed`/`jump_released` edges themselves, like `read_input` does.
+    """
+
+    def __call__(self, world: PlayWorld) -> InputState: ...
+
+
 def read_input(prev: InputState | None) -> InputState:
+    import pyxel  # local import: InputState is also used by the headless simulation
+
     state = InputState()
 
     # Keyboard
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+
+from game.chunks import ENEMY_KINDS, GENERATOR_VERSION, ITEM_KINDS, Chunk, LayoutKey, Row
+
+# Layout file: MAGIC, header (generator version, layout key, ground row, chunk count),
+# then a zlib-compressed body: per chunk a u16 row count and its rows (x, absolute y,
+# width, item, enemy, enemy with giants). Kinds are stored as 1 + their index in
+# ITEM_KINDS / ENEMY_KINDS (0 = none).
+MAGIC = b"LAY1"
+_HEAD = struct.Struct("<HQiddd")
+_ROW = struct.Struct("<hiHBBB")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+DEFAULT_BUDGET_BYTES = 1 << 20
+
+
+def _kind_code(kinds: Sequence[str], kind: str | None) -> int:
+    return 0 if kind is None else kinds.index(kind) + 1
+
+
+def _kind(kinds: Sequence[str], code: int) -> str | None:
+    return kinds[code - 1] if code else None
+
+
+def _pack_row(row: Row) -> bytes:
+    return _ROW.pack(
+        row.x,
+        row.y,
+        row.w,
+        _kind_code(ITEM_KINDS, row.item),
+        _kind_code(ENEMY_KINDS, row.enemy),
+        _kind_code(ENEMY_KINDS, row.enemy_with_giants),
+    )
+
+
+def _unpack_row(raw: tuple[int, int, int, int, int, int]) -> Row:
+    x, y, w, item, enemy, enemy_with_giants = raw
+    return Row(x, y, w, _kind(ITEM_KINDS, item), _kind(ENEMY_KINDS, enemy), _kind(ENEMY_KINDS, enemy_with_giants))
+
+
+def encode_layout(key: LayoutKey, ground: Row, chunks: Sequence[Chunk]) -> bytes:
+    head = _HEAD.pack(GENERATOR_VERSION, key.seed, key.start_y, key.jump_mult, key.gravity_mult, key.speed_mult)
+    body = bytearray()
+    for chunk in chunks:
+        body += _U16.pack(len(chunk.rows))
+        for row in chunk.rows:
+            body += _pack_row(row)
+    return MAGIC + head + _pack_row(ground) + _U32.pack(len(chunks)) + zlib.compress(bytes(body), 9)
+
+
+def decode_layout(data: bytes, key: LayoutKey, ground: Row) -> list[Chunk] | None:
+    """Chunks stored in `data`, or None unless it was written by this generator for `key` and `ground`."""
+    if not data.startswith(MAGIC):
+        return None
+    pos = len(MAGIC)
+    version, seed, start_y, jump_mult, gravity_mult, speed_mult = _HEAD.unpack_from(data, pos)
+    pos += _HEAD.size
+    stored_ground = _unpack_row(_ROW.unpack_from(data, pos))
+    pos += _ROW.size
+    (count,) = _U32.unpack_from(data, pos)
+    pos += _U32.size
+    if version != GENERATOR_VERSION or stored_ground != ground:
+        return None
+    if LayoutKey(seed, start_y, jump_mult, gravity_mult, speed_mult) != key:
+        return None
+
+    body = zlib.decompress(data[pos:])
+    chunks: list[Chunk] = []
+    pos = 0
+    for index in range(count):
+        (n,) = _U16.unpack_from(body, pos)
+        pos += _U16.size
+        end = pos + n * _ROW.size
+        rows = tuple(_unpack_row(raw) for raw in _ROW.iter_unpack(body[pos:end]))
+        pos = end
+        chunks.append(Chunk(index, rows))
+    return chunks
+
+
+class LayoutCache:
+    """
+    Pregenerated layouts on disk, one file per (run seed, generator version, character jump).
+
+    `load()` returns the chunks a previous run with the same layout key already
+    generated, so the next run streams them instead of generating; `store()` writes a
+    longer layout back. Files are bumped on every load, and `store()` then removes the
+    least recently used ones until the directory fits in `budget_bytes`. Any I/O or
+    format problem is a plain cache miss.
+    """
+
+    def __init__(self, save_dir: str = "save", budget_bytes: int = DEFAULT_BUDGET_BYTES) -> None:
+        self.dir = os.path.join(save_dir, "layouts")
+        self.budget_bytes = max(0, int(budget_bytes))
+
+    def path(self, key: LayoutKey) -> str:
+        # Everything but the seed and the version only varies with the character.
+        spec = f"{key.start_y}/{key.jump_mult!r}/{key.gravity_mult!r}/{key.speed_mult!r}".encode("utf-8")
+        tag = hashlib.sha1(spec).hexdigest()[:8]
+        return os.path.join(self.dir, f"{key.seed:016x}_v{GENERATOR_VERSION}_{tag}.lay")
+
+    def load(self, key: LayoutKey, ground: Row) -> list[Chunk]:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                chunks = decode_layout(f.read(), key, ground)
+            if chunks is None:
+                return []
+            os.utime(path)
+            return chunks
+        except Exception:
+            return []
+
+    def store(self, key: LayoutKey, ground: Row, chunks: Sequence[Chunk]) -> str | None:
+        path = self.path(key)
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(encode_layout(key, ground, chunks))
+            os.replace(tmp_path, path)
+            self._evict(keep=path)
+            return path
+        except Exception:
+            return None
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for name in os.listdir(self.dir):
+            if name.endswith(".lay"):
+                p = os.path.join(self.dir, name)
+                st = os.stat(p)
+                entries.append((st.st_mtime_ns, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.budget_bytes:
+                break
+            if p == keep:
+                continue
+            os.remove(p)
+            total -= size
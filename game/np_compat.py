@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+# NumPy is optional (web builds ship without it): import `np` from here and fall back
+# to pure Python when it is None.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+HAS_NUMPY = np is not None
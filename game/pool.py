@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Pool(Generic[T]):
+    """
+    Typed free list shared by a spawner (acquire) and a culler (release).
+
+    `acquire(*args)` pops a released object (a hit) or builds one with `factory` (a
+    miss), then always runs `reset(obj, *args)`, so callers never see stale state.
+    `high_water` is the most objects live at once; after warm-up every acquire
+    should be a hit.
+    """
+
+    def __init__(self, factory: Callable[[], T], reset: Callable[..., None]) -> None:
+        self._factory = factory
+        self._reset = reset
+        self._free: list[T] = []
+        self.live = 0
+        self.high_water = 0
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, *args) -> T:
+        if self._free:
+            obj = self._free.pop()
+            self.hits += 1
+        else:
+            obj = self._factory()
+            self.misses += 1
+        self._reset(obj, *args)
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+
+    def release(self, obj: T) -> None:
+        self._free.append(obj)
+        self.live -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "live": self.live,
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
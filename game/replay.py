@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from game.character import CharacterSpec
+from game.chunks import GENERATOR_VERSION
+from game.config import GameConfig
+from game.constants import REBASE_FLOORS, SIM_HZ
+from game.input import InputState
+from game.world import PlayWorld
+
+# Replay file: MAGIC, u32 header length, JSON header, then a zlib-compressed body of
+# varints: run count, (input bits, run length) pairs, checksum count, u32 checksums.
+MAGIC = b"RPL1"
+_U32 = struct.Struct("<I")
+
+# Only these fields change the simulation; the rest (fonts, volumes, ...) don't matter.
+SIM_CONFIG_FIELDS: tuple[str, ...] = (
+    "scroll_start_player_screen_y",
+    "fall_below_screen_px",
+    "water_start_offset",
+    "water_base_speed",
+    "water_speed_per_floor",
+    "zone_floor_step",
+)
+
+# InputState fields the simulation reads, in bit order.
+_INPUT_BITS: tuple[str, ...] = ("left", "right", "jump_down", "jump_pressed", "jump_released")
+
+CHECKSUM_EVERY = 300
+
+
+def sim_config(cfg: GameConfig) -> dict:
+    return {name: getattr(cfg, name) for name in SIM_CONFIG_FIELDS}
+
+
+def config_hash(cfg: GameConfig) -> str:
+    raw = json.dumps(sim_config(cfg), sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def pack_input(inp: InputState) -> int:
+    bits = 0
+    for i, name in enumerate(_INPUT_BITS):
+        if getattr(inp, name):
+            bits |= 1 << i
+    return bits
+
+
+def unpack_input(bits: int) -> InputState:
+    return InputState(**{name: bool(bits >> i & 1) for i, name in enumerate(_INPUT_BITS)})
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+@dataclass
+class Replay:
+    """
+    One recorded run: everything needed to re-simulate it bit for bit.
+
+    `runs` is the run-length encoded per-step input (bits, count); `checksums[i]` is
+    `PlayWorld.state_checksum()` after step (i + 1) * `checksum_every`. Only replays
+    of the current level generator (`generator_version`) can be re-simulated.
+    """
+
+    prompt: str
+    seed: int
+    character: CharacterSpec
+    config: dict
+    config_hash: str
+    dt: float = 1.0 / SIM_HZ
+    rebase_floors: int = REBASE_FLOORS
+    checksum_every: int = CHECKSUM_EVERY
+    runs: list[tuple[int, int]] = field(default_factory=list)
+    checksums: list[int] = field(default_factory=list)
+    floor: int = 0
+    reason: str = ""
+    generator_version: int = GENERATOR_VERSION
+    _ends: list[int] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def frames(self) -> int:
+        return sum(n for _, n in self.runs)
+
+    def inputs(self):
+        for bits, n in self.runs:
+            inp = unpack_input(bits)
+            for _ in range(n):
+                yield inp
+
+    def input_at(self, i: int) -> InputState:
+        """Input of step `i` (0-based), by bisecting the run ends."""
+        ends = self._ends
+        # Recorded runs only ever grow at the end, so a stale cache shows up as a
+        # count mismatch or an index past the cached end.
+        if ends is None or len(ends) != len(self.runs) or (ends and i >= ends[-1]):
+            ends = []
+            total = 0
+            for _, n in self.runs:
+                total += n
+                ends.append(total)
+            self._ends = ends
+        k = bisect_right(ends, i)
+        if k >= len(ends):
+            raise IndexError(i)
+        return unpack_input(self.runs[k][0])
+
+    def to_bytes(self) -> bytes:
+        header = {
+            "prompt": self.prompt,
+            "seed": self.seed,
+            "character": dataclasses.asdict(self.character),
+            "config": self.config,
+            "config_hash": self.config_hash,
+            "dt": self.dt,
+            "rebase_floors": self.rebase_floors,
+            "checksum_every": self.checksum_every,
+            "frames": self.frames,
+            "floor": self.floor,
+            "reason": self.reason,
+            "generator_version": self.generator_version,
+        }
+        head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        body = bytearray()
+        _put_varint(body, len(self.runs))
+        for bits, n in self.runs:
+            body.append(bits)
+            _put_varint(body, n)
+        _put_varint(body, len(self.checksums))
+        for c in self.checksums:
+            body += _U32.pack(c)
+        return MAGIC + _U32.pack(len(head)) + head + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if data[:4] != MAGIC:
+            raise ValueError("not a replay file")
+        (hlen,) = _U32.unpack_from(data, 4)
+        header = json.loads(data[8 : 8 + hlen].decode("utf-8"))
+        _check_generator(int(header.get("generator_version", 0)))
+        body = zlib.decompress(data[8 + hlen :])
+        pos = 0
+        count, pos = _get_varint(body, pos)
+        runs: list[tuple[int, int]] = []
+        for _ in range(count):
+            bits = body[pos]
+            n, pos = _get_varint(body, pos + 1)
+            runs.append((bits, n))
+        count, pos = _get_varint(body, pos)
+        checksums = [_U32.unpack_from(body, pos + 4 * i)[0] for i in range(count)]
+        return cls(
+            prompt=str(header["prompt"]),
+            seed=int(header["seed"]),
+            character=CharacterSpec(**header["character"]),
+            config=dict(header["config"]),
+            config_hash=str(header["config_hash"]),
+            dt=float(header.get("dt", 1.0 / SIM_HZ)),
+            rebase_floors=int(header.get("rebase_floors", REBASE_FLOORS)),
+            checksum_every=int(header.get("checksum_every", CHECKSUM_EVERY)),
+            runs=runs,
+            checksums=checksums,
+            floor=int(header.get("floor", 0)),
+            reason=str(header.get("reason", "")),
+        )
+
+
+def _check_generator(version: int) -> None:
+    if version != GENERATOR_VERSION:
+        raise ValueError(f"replay was recorded with level generator v{version}; this build has v{GENERATOR_VERSION}")
+
+
+class ReplayRecorder:
+    """Append each simulation step's input (and periodic state checksums) to a Replay."""
+
+    def __init__(
+        self,
+        *,
+        prompt: str,
+        seed: int,
+        character: CharacterSpec,
+        cfg: GameConfig,
+        dt: float = 1.0 / SIM_HZ,
+        rebase_floors: int = REBASE_FLOORS,
+        checksum_every: int = CHECKSUM_EVERY,
+    ) -> None:
+        self.replay = Replay(
+            prompt=prompt,
+            seed=seed,
+            character=character,
+            config=sim_config(cfg),
+            config_hash=config_hash(cfg),
+            dt=dt,
+            rebase_floors=rebase_floors,
+            checksum_every=max(1, int(checksum_every)),
+        )
+        self._steps = 0
+
+    def record(self, inp: InputState, world) -> None:
+        """Call once per `world.step(dt, inp)`, after the step."""
+        bits = pack_input(inp)
+        runs = self.replay.runs
+        if runs and runs[-1][0] == bits:
+            runs[-1] = (bits, runs[-1][1] + 1)
+        else:
+            runs.append((bits, 1))
+        self._steps += 1
+        if self._steps % self.replay.checksum_every == 0:
+            self.replay.checksums.append(world.state_checksum())
+
+    def finish(self, world) -> Replay:
+        self.replay.floor = world.floor
+        self.replay.reason = world.reason if world.over else ""
+        return self.replay
+
+
+def verify_replay(replay: Replay, cfg: GameConfig | None = None) -> dict:
+    """
+    Re-simulate `replay` headless as fast as possible, comparing every checksum.
+
+    Uses the recorded simulation config (on top of `cfg` or the loaded config) so the
+    result doesn't depend on local settings. Returns a JSON-friendly report.
+    """
+    _check_generator(replay.generator_version)
+    base = cfg or GameConfig.load()
+    cfg = dataclasses.replace(base, **replay.config)
+    world = PlayWorld(cfg)
+    world.reset(seed=replay.seed, character=replay.character)
+    world.rebase_floors = replay.rebase_floors
+    dt = replay.dt
+    every = replay.checksum_every
+    expected = replay.checksums
+    mismatch: int | None = None
+    checked = 0
+    steps = 0
+    t0 = time.perf_counter()
+    for inp in replay.inputs():
+        world.step(dt, inp)
+        steps += 1
+        if steps % every == 0:
+            k = steps // every - 1
+            if k < len(expected):
+                checked += 1
+                if world.state_checksum() != expected[k]:
+                    mismatch = steps
+                    break
+    wall = time.perf_counter() - t0
+    ok = mismatch is None and world.floor == replay.floor and (not replay.reason or world.reason == replay.reason)
+    return {
+        "ok": ok,
+        "frames": steps,
+        "checksums_checked": checked,
+        "first_mismatch_frame": mismatch,
+        "config_hash_match": config_hash(cfg) == replay.config_hash,
+        "floor": world.floor,
+        "reason": world.reason if world.over else None,
+        "expected_floor": replay.floor,
+        "expected_reason": replay.reason or None,
+        "wall_seconds": round(wall, 4),
+        "speedup": round(steps * dt / wall, 1) if wall > 0 else None,
+    }
+
+
+def save_replay(replay: Replay, save_dir: str = "save", keep: int = 20) -> str | None:
+    """Write `replay` under `<save_dir>/replays/`, keeping only the newest `keep` files."""
+    out_dir = os.path.join(save_dir, "replays")
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(out_dir, f"{stamp}_f{replay.floor}.rpl")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(replay.to_bytes())
+        os.replace(tmp_path, path)
+        files = sorted(n for n in os.listdir(out_dir) if n.endswith(".rpl"))
+        for name in files[:-keep]:
+            os.remove(os.path.join(out_dir, name))
+        return path
+    except Exception:
+        return None
+
+
+def load_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        return Replay.from_bytes(f.read())
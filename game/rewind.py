@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import zlib
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from game.input import InputState
+from game.world import PlayWorld
+
+
+@dataclass
+class _Group:
+    """A keyframe (kept raw: it is the zlib dictionary for its deltas) and its deltas."""
+
+    key_frame: int
+    key_raw: bytes
+    deltas: dict[int, bytes]
+
+    def nbytes(self) -> int:
+        return len(self.key_raw) + sum(len(d) for d in self.deltas.values())
+
+
+class RewindBuffer:
+    """
+    Bounded history of `PlayWorld.snapshot()`s, stored as zlib deltas against periodic
+    keyframes; the oldest group is dropped past `budget_bytes`.
+    """
+
+    def __init__(self, every: int = 30, keyframe_every: int = 20, budget_bytes: int = 4 << 20) -> None:
+        self.every = max(1, int(every))
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._groups: deque[_Group] = deque()
+        self._index: dict[int, _Group] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        self._groups.clear()
+        self._index.clear()
+        self._bytes = 0
+
+    def maybe_capture(self, world: PlayWorld) -> bool:
+        """Capture if `world.frame` is on the snapshot grid; call after each step."""
+        if world.frame % self.every != 0 or world.frame in self._index:
+            return False
+        self.capture(world)
+        return True
+
+    def capture(self, world: PlayWorld) -> None:
+        frame = world.frame
+        raw = world.snapshot()
+        group = self._groups[-1] if self._groups else None
+        if group is None or frame < group.key_frame or len(group.deltas) + 1 >= self.keyframe_every:
+            group = _Group(key_frame=frame, key_raw=raw, deltas={})
+            self._groups.append(group)
+            self._bytes += len(raw)
+        else:
+            comp = zlib.compressobj(6, zdict=group.key_raw)
+            delta = comp.compress(raw) + comp.flush()
+            group.deltas[frame] = delta
+            self._bytes += len(delta)
+        self._index[frame] = group
+        self._evict()
+
+    def _evict(self) -> None:
+        # Never drop the group being written to.
+        while self._bytes > self.budget_bytes and len(self._groups) > 1:
+            group = self._groups.popleft()
+            self._bytes -= group.nbytes()
+            self._index.pop(group.key_frame, None)
+            for frame in group.deltas:
+                self._index.pop(frame, None)
+
+    def _raw(self, frame: int) -> bytes:
+        group = self._index[frame]
+        if frame == group.key_frame:
+            return group.key_raw
+        decomp = zlib.decompressobj(zdict=group.key_raw)
+        return decomp.decompress(group.deltas[frame]) + decomp.flush()
+
+    def nearest(self, frame: int) -> int | None:
+        """Latest stored frame at or before `frame` (snapshots sit on the `every` grid)."""
+        if not self._index:
+            return None
+        last = self._groups[-1]
+        f = min(frame, next(reversed(last.deltas), last.key_frame))
+        f -= f % self.every
+        oldest = self._groups[0].key_frame
+        while f >= oldest:
+            if f in self._index:
+                return f
+            f -= self.every
+        return None
+
+    def restore(self, world: PlayWorld, frame: int) -> int:
+        """Restore the latest snapshot at or before `frame`; returns its frame."""
+        at = self.nearest(frame)
+        if at is None:
+            raise KeyError(f"no snapshot at or before frame {frame}")
+        world.restore(self._raw(at))
+        return at
+
+    def seek(self, world: PlayWorld, frame: int, input_at: Callable[[int], InputState], dt: float) -> None:
+        """Restore the nearest snapshot, then re-simulate to `frame` (`input_at(k)`: input of step k)."""
+        self.restore(world, frame)
+        while world.frame < frame and not world.over:
+            world.step(dt, input_at(world.frame + 1))
+
+
+def first_divergence(
+    a: PlayWorld,
+    b: PlayWorld,
+    input_at: Callable[[int], InputState],
+    frames: int,
+    dt: float,
+    every: int = 30,
+) -> int | None:
+    """First frame at which `a` and `b` disagree on `state_checksum()`, or None."""
+    if a.state_checksum() != b.state_checksum():
+        return a.frame
+    buf_a = RewindBuffer(every=every)
+    buf_b = RewindBuffer(every=every)
+    buf_a.capture(a)
+    buf_b.capture(b)
+    good = a.frame
+    bad: int | None = None
+    for k in range(a.frame + 1, frames + 1):
+        inp = input_at(k)
+        a.step(dt, inp)
+        b.step(dt, inp)
+        if k % every == 0 or k == frames or a.over or b.over:
+            if a.state_checksum() != b.state_checksum():
+                bad = k
+                break
+            good = k
+            buf_a.maybe_capture(a)
+            buf_b.maybe_capture(b)
+        if a.over and b.over:
+            return None
+    if bad is None:
+        return None
+
+    buf_a.seek(a, good, input_at, dt)
+    buf_b.seek(b, good, input_at, dt)
+    for k in range(good + 1, bad + 1):
+        inp = input_at(k)
+        a.step(dt, inp)
+        b.step(dt, inp)
+        if a.state_checksum() != b.state_checksum():
+            return k
+    return bad
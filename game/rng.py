@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import random
+
+# Streams every world has. Each consumer draws only from its own stream, so e.g. the
+# number of frames rendered (shake, particles) can never change the level layout
+# (which is drawn from per-chunk `substream`s, see game.chunks).
+STREAMS: tuple[str, ...] = ("vfx", "shake")
+
+RngState = dict[str, tuple]
+
+
+def substream(seed: int, name: str) -> random.Random:
+    """A fresh generator for `name` under `seed`, the same one `RngStreams(seed).stream(name)` starts as."""
+    # String seeds are hashed with SHA-512 by `random`, independent of PYTHONHASHSEED.
+    return random.Random(f"{int(seed)}/{name}")
+
+
+class RngStreams:
+    """
+    Registry of named `random.Random` streams derived from one seed.
+
+    `seed()` re-seeds the existing generators in place, so consumers may keep a
+    reference to their stream across resets. `snapshot()`/`restore()` capture and
+    rewind every stream at once.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self._streams: dict[str, random.Random] = {name: random.Random() for name in STREAMS}
+        self.seed(seed)
+
+    def seed(self, seed: int) -> None:
+        self._seed = int(seed)
+        for name, r in self._streams.items():
+            r.seed(self._derive(name))
+
+    def _derive(self, name: str) -> str:
+        # Same derivation as `substream`.
+        return f"{self._seed}/{name}"
+
+    def stream(self, name: str) -> random.Random:
+        r = self._streams.get(name)
+        if r is None:
+            r = random.Random(self._derive(name))
+            self._streams[name] = r
+        return r
+
+    def snapshot(self) -> RngState:
+        return {name: r.getstate() for name, r in self._streams.items()}
+
+    def restore(self, state: RngState) -> None:
+        for name, st in state.items():
+            self.stream(name).setstate(st)
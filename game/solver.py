@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from game.bot import HeuristicBot
+from game.character import CharacterSpec
+from game.config import GameConfig
+from game.constants import PLAYER_H, SIM_HZ
+from game.farm import FarmTask, make_tasks, simulate
+from game.input import InputState
+from game.replay import ReplayRecorder, config_hash
+from game.theme import build_theme
+from game.world import PlayWorld
+
+# A macro action, played from standing until the player stands again:
+# (walk frames, negative = left; charge fraction to release at; air steer -1/0/+1).
+# None means "one jump as HeuristicBot would play it".
+Action = tuple[int, float, int] | None
+
+ACTIONS: tuple[Action, ...] = (None,) + tuple(
+    (walk, charge, air)
+    for walk in (0, -20, 20)
+    for charge in (0.45, 0.75, 1.0)
+    for air in (-1, 0, 1)
+)
+
+# A macro that hasn't landed after this many steps (stuck, hitstop chains) is cut short.
+MACRO_MAX_FRAMES = 240
+# Quantization of the memo key: player x / absolute y in px.
+MEMO_X_PX = 8
+MEMO_Y_PX = 4
+
+
+@dataclass
+class _Node:
+    raw: bytes
+    path: tuple[Action, ...]
+    score: tuple
+
+
+def play_action(world: PlayWorld, action: Action, dt: float, emit: Callable[[InputState], None] | None = None) -> None:
+    """Step `world` through one macro action; `emit(inp)` sees every step's input."""
+    bot = HeuristicBot() if action is None else None
+    walk, charge, air = action or (0, 1.0, 0)
+    left_ground = False
+    prev_down = False
+    for i in range(MACRO_MAX_FRAMES):
+        p = world.player
+        if bot is not None:
+            inp = bot(world)
+        elif p.grounded and not left_ground and i < abs(walk):
+            inp = InputState(left=walk < 0, right=walk > 0)
+        elif p.grounded and not left_ground:
+            down = not prev_down or p.charge < charge
+            inp = InputState(jump_down=down, jump_pressed=down and not prev_down, jump_released=prev_down and not down)
+            if not down:
+                inp.left = air < 0
+                inp.right = air > 0
+            prev_down = down
+        else:
+            inp = InputState(left=air < 0, right=air > 0)
+        landed = False
+        for ev in world.step(dt, inp):
+            if ev.kind == "land" and left_ground:
+                landed = True
+        if emit is not None:
+            emit(inp)
+        left_ground = left_ground or not world.player.grounded
+        if landed or world.over:
+            return
+
+
+def _score(world: PlayWorld) -> tuple:
+    # Higher feet (smaller absolute y) first, then more HP, then earlier (water is rising).
+    feet = world.player.y + PLAYER_H - world.origin_y
+    return (-feet, world.player.hp, -world.frame)
+
+
+def _memo_key(world: PlayWorld) -> tuple[int, int, int]:
+    p = world.player
+    return (int(p.x // MEMO_X_PX), int((p.y - world.origin_y) // MEMO_Y_PX), p.hp)
+
+
+def _new_world(task: FarmTask, cfg: GameConfig) -> PlayWorld:
+    world = PlayWorld(cfg)
+    world.reset(seed=task.seed, character=CharacterSpec.from_seed(task.seed))
+    return world
+
+
+def _settle(world: PlayWorld, dt: float, emit: Callable[[InputState], None] | None = None) -> None:
+    """Idle until the player first stands (the run starts in the air)."""
+    for _ in range(MACRO_MAX_FRAMES):
+        if world.player.grounded or world.over:
+            return
+        inp = InputState()
+        world.step(dt, inp)
+        if emit is not None:
+            emit(inp)
+
+
+def beam_search(
+    task: FarmTask,
+    cfg: GameConfig,
+    *,
+    beam: int = 4,
+    max_depth: int = 600,
+    time_limit: float = 300.0,
+) -> dict:
+    """
+    Highest floor reachable on `task`'s layout, searching macro actions with a beam.
+
+    Each depth expands every beam node by every action in `ACTIONS` on a cloned world
+    (`snapshot()`/`restore()`), then keeps the `beam` best children by height. A child
+    whose quantized (x, y, hp) was already reached at the same or an earlier frame is
+    pruned: it can only be worse, since the water only rises. The search stops when
+    no child survives, at `max_depth`, or after `time_limit` seconds.
+    """
+    dt = 1.0 / SIM_HZ
+    world = _new_world(task, cfg)
+    _settle(world, dt)
+    best_floor = world.floor
+    best_path: tuple[Action, ...] = ()
+    nodes = [_Node(world.snapshot(), (), _score(world))]
+    seen: dict[tuple[int, int, int], int] = {}
+    expanded = 0
+    depth = 0
+    t0 = time.perf_counter()
+    stopped = "exhausted"
+    while nodes:
+        if depth >= max_depth:
+            stopped = "max_depth"
+            break
+        if time.perf_counter() - t0 > time_limit:
+            stopped = "time_limit"
+            break
+        depth += 1
+        children: list[_Node] = []
+        for node in nodes:
+            for action in ACTIONS:
+                world.restore(node.raw)
+                play_action(world, action, dt)
+                expanded += 1
+                if world.floor > best_floor:
+                    best_floor = world.floor
+                    best_path = node.path + (action,)
+                if world.over:
+                    continue
+                key = _memo_key(world)
+                prev = seen.get(key)
+                if prev is not None and prev <= world.frame:
+                    continue
+                seen[key] = world.frame
+                children.append(_Node(world.snapshot(), node.path + (action,), _score(world)))
+        children.sort(key=lambda n: n.score, reverse=True)
+        nodes = children[:beam]
+    return {
+        "ceiling": best_floor,
+        "path": [list(a) if a is not None else None for a in best_path],
+        "depth": depth,
+        "expanded": expanded,
+        "memo_size": len(seen),
+        "stopped": stopped,
+        "search_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def replay_path(task: FarmTask, cfg: GameConfig, path: list) -> bytes:
+    """Re-play a solution path into a replay file (e.g. to watch or verify it)."""
+    dt = 1.0 / SIM_HZ
+    world = _new_world(task, cfg)
+    rec = ReplayRecorder(
+        prompt=build_theme(task.prompt).prompt,
+        seed=task.seed,
+        character=CharacterSpec.from_seed(task.seed),
+        cfg=cfg,
+        dt=dt,
+        rebase_floors=world.rebase_floors,
+    )
+
+    def emit(inp: InputState) -> None:
+        rec.record(inp, world)
+
+    _settle(world, dt, emit)
+    for action in path:
+        play_action(world, tuple(action) if action is not None else None, dt, emit)
+    return rec.finish(world).to_bytes()
+
+
+def solve(task: FarmTask, cfg: GameConfig, params: dict) -> dict:
+    """Worker entry: ceiling by beam search next to what the heuristic bot reaches."""
+    result = beam_search(task, cfg, **params)
+    bot = simulate(task, cfg, frames=36000)
+    return {
+        "id": task.run_id,
+        "prompt": task.prompt,
+        "seed": task.seed,
+        "config_hash": config_hash(cfg),
+        "params": params,
+        "bot_floor": bot["floor"],
+        "bot_reason": bot["reason"],
+        **result,
+        "replay": replay_path(task, cfg, result["path"]).hex(),
+    }
+
+
+def _ceiling_path(out_dir: str, seed: int) -> str:
+    return os.path.join(out_dir, f"{seed}.json")
+
+
+def _is_done(out_dir: str, task: FarmTask, cfg_hash: str, params: dict) -> bool:
+    try:
+        with open(_ceiling_path(out_dir, task.seed), "r", encoding="utf-8") as f:
+            old = json.load(f)
+    except Exception:
+        return False
+    return old.get("config_hash") == cfg_hash and old.get("params") == params
+
+
+def _write_ceiling(out_dir: str, row: dict) -> None:
+    replay = bytes.fromhex(row.pop("replay"))
+    base = _ceiling_path(out_dir, row["seed"])
+    with open(f"{base[:-5]}.rpl", "wb") as f:
+        f.write(replay)
+    tmp_path = f"{base}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(row, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, base)
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--runs", type=int, default=8, help="number of seeds to solve (default: 8)")
+    ap.add_argument("--prompts", default="default", help="comma-separated theme prompts, used round-robin")
+    ap.add_argument("--beam", type=int, default=4, help="beam width (default: 4)")
+    ap.add_argument("--max-depth", type=int, default=600, help="max jumps searched per seed")
+    ap.add_argument("--time-limit", type=float, default=300.0, help="search seconds per seed (default: 300)")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--out-dir", default=os.path.join("save", "ceilings"), help="per-seed ceiling files")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m game --solve", description="Search the max reachable floor per seed.")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    cfg = GameConfig.load()
+    cfg_hash = config_hash(cfg)
+    params = {"beam": max(1, args.beam), "max_depth": max(1, args.max_depth), "time_limit": args.time_limit}
+    prompts = [p.strip() for p in args.prompts.split(",") if p.strip()] or ["default"]
+    os.makedirs(args.out_dir, exist_ok=True)
+    # Seeds already solved with the same config and search parameters are skipped.
+    tasks = [t for t in make_tasks(prompts, args.runs) if not _is_done(args.out_dir, t, cfg_hash, params)]
+
+    summary: list[dict] = []
+    workers = max(1, int(args.workers or os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve, t, cfg, params) for t in tasks]
+        try:
+            for fut in as_completed(futures):
+                row = fut.result()
+                _write_ceiling(args.out_dir, row)
+                summary.append({k: row[k] for k in ("id", "seed", "ceiling", "bot_floor", "stopped")})
+                sys.stderr.write(f"{row['id']}: ceiling {row['ceiling']} (bot {row['bot_floor']})\n")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            sys.stderr.write(f"interrupted; solved seeds are kept in {args.out_dir}\n")
+            return 130
+    json.dump({"solved": summary, "skipped": args.runs - len(tasks)}, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
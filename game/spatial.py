@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Generic, Protocol, TypeVar
+
+from game.geom import Rect
+
+
+class HasRect(Protocol):
+    rect: Rect
+
+
+T = TypeVar("T", bound=HasRect)
+
+
+class SpatialHash(Generic[T]):
+    """
+    World-space uniform grid broad phase.
+
+    Each entity is bucketed into every cell its rect touches. `update()` re-buckets an
+    entity only when its covered cell range changes, so moving entities cost O(1) per
+    frame. Queries visit only the cells under the query box and return exact AABB
+    overlaps in insertion order, which keeps collision resolution order deterministic
+    (and identical to scanning the entity list in spawn order). The returned list is a
+    scratch buffer reused by the next query.
+    """
+
+    def __init__(self, cell_size: int = 128) -> None:
+        self.cell_size = max(1, int(cell_size))
+        self._cells: dict[tuple[int, int], dict[int, T]] = {}
+        # id(obj) -> (seq, obj, covered cell range)
+        self._entries: dict[int, tuple[int, T, tuple[int, int, int, int]]] = {}
+        self._seq = 0
+        self._found: dict[int, T] = {}
+        self._hits: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell_range(self, x: float, y: float, w: float, h: float) -> tuple[int, int, int, int]:
+        cs = self.cell_size
+        # Rect edges are half-open (right/bottom excluded), so a zero-size box still covers one cell.
+        return (
+            int(x // cs),
+            int(y // cs),
+            int((x + max(w, 1) - 1) // cs),
+            int((y + max(h, 1) - 1) // cs),
+        )
+
+    def _link(self, key: int, obj: T, cr: tuple[int, int, int, int]) -> None:
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cr
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = {}
+                    cells[(cx, cy)] = bucket
+                bucket[key] = obj
+
+    def _unlink(self, key: int, cr: tuple[int, int, int, int]) -> None:
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cr
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.pop(key, None)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def __getstate__(self) -> dict:
+        # Buckets are keyed by id(), which doesn't survive pickling: store the entities
+        # in insertion order and re-bucket them on load.
+        entries = sorted(self._entries.values(), key=lambda e: e[0])
+        return {"cell_size": self.cell_size, "seq": self._seq, "entries": [(seq, obj) for seq, obj, _ in entries]}
+
+    def __setstate__(self, state: dict) -> None:
+        self.cell_size = state["cell_size"]
+        self._cells = {}
+        self._entries = {}
+        self._found = {}
+        self._hits = []
+        for seq, obj in state["entries"]:
+            r = obj.rect
+            cr = self._cell_range(r.x, r.y, r.w, r.h)
+            self._entries[id(obj)] = (seq, obj, cr)
+            self._link(id(obj), obj, cr)
+        self._seq = state["seq"]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entries.clear()
+        self._seq = 0
+
+    def insert(self, obj: T) -> None:
+        key = id(obj)
+        if key in self._entries:
+            self.update(obj)
+            return
+        r = obj.rect
+        cr = self._cell_range(r.x, r.y, r.w, r.h)
+        self._entries[key] = (self._seq, obj, cr)
+        self._seq += 1
+        self._link(key, obj, cr)
+
+    def update(self, obj: T) -> None:
+        key = id(obj)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.insert(obj)
+            return
+        seq, _, old = entry
+        r = obj.rect
+        cr = self._cell_range(r.x, r.y, r.w, r.h)
+        if cr == old:
+            return
+        self._unlink(key, old)
+        self._link(key, obj, cr)
+        self._entries[key] = (seq, obj, cr)
+
+    def remove(self, obj: T) -> None:
+        entry = self._entries.pop(id(obj), None)
+        if entry is None:
+            return
+        self._unlink(id(obj), entry[2])
+
+    def rebuild(self) -> None:
+        """Re-bucket every entity (e.g. after all rects were shifted at once)."""
+        entries = sorted(self._entries.values(), key=lambda e: e[0])
+        self._cells.clear()
+        self._entries.clear()
+        for _, obj, _ in entries:
+            self.insert(obj)
+
+    def query_box(self, x: float, y: float, w: float, h: float) -> list[T]:
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        right = x + w
+        bottom = y + h
+        found = self._found
+        found.clear()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key, obj in bucket.items():
+                    if key in found:
+                        continue
+                    r = obj.rect
+                    if r.right <= x or r.x >= right or r.bottom <= y or r.y >= bottom:
+                        continue
+                    found[key] = obj
+        hits = self._hits
+        hits.clear()
+        hits.extend(found.values())
+        found.clear()
+        if len(hits) > 1:
+            hits.sort(key=self._seq_of)
+        return hits
+
+    def _seq_of(self, obj: T) -> int:
+        return self._entries[id(obj)][0]
+
+    def query_swept(self, rect: Rect, dx: float, dy: float) -> list[T]:
+        """Entities overlapping the box swept by `rect` moving by (dx, dy), in insertion order."""
+        x0 = min(rect.x, rect.x + dx)
+        y0 = min(rect.y, rect.y + dy)
+        return self.query_box(x0, y0, rect.w + abs(dx), rect.h + abs(dy))
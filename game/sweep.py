@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+from contextlib import closing
+
+from game.config import GameConfig
+from game.farm import FarmTask, make_tasks, pool_imap, simulate
+from game.replay import config_hash, sim_config
+
+# GameConfig fields a sweep may vary: water pacing and the fail/scroll thresholds.
+SWEEP_FIELDS: tuple[str, ...] = (
+    "water_base_speed",
+    "water_speed_per_floor",
+    "water_start_offset",
+    "fall_below_screen_px",
+    "scroll_start_player_screen_y",
+)
+
+
+def parse_axis(spec: str) -> tuple[str, list[float] | tuple[float, float]]:
+    """`name=a,b,c` (explicit values) or `name=lo:hi` (a range, sampled by grid/LHS)."""
+    name, _, raw = spec.partition("=")
+    name = name.strip().replace("-", "_")
+    if name not in SWEEP_FIELDS:
+        raise ValueError(f"{name!r} is not sweepable (choose from {', '.join(SWEEP_FIELDS)})")
+    if ":" in raw:
+        lo, hi = (float(v) for v in raw.split(":", 1))
+        return name, (lo, hi)
+    values = [float(v) for v in raw.split(",") if v.strip()]
+    if not values:
+        raise ValueError(f"no values for {name!r}")
+    return name, values
+
+
+def grid_points(axes: dict[str, list[float] | tuple[float, float]], steps: int) -> list[dict[str, float]]:
+    """Full factorial; ranges are split into `steps` evenly spaced values (ends included)."""
+    values: list[list[float]] = []
+    for axis in axes.values():
+        if isinstance(axis, tuple):
+            lo, hi = axis
+            n = max(1, steps)
+            axis = [lo + (hi - lo) * i / (n - 1) for i in range(n)] if n > 1 else [lo]
+        values.append(axis)
+    return [dict(zip(axes, combo)) for combo in itertools.product(*values)]
+
+
+def lhs_points(axes: dict[str, list[float] | tuple[float, float]], n: int, seed: int = 0) -> list[dict[str, float]]:
+    """
+    Latin hypercube: `n` points where every axis' range is cut into `n` strata and each
+    stratum is used exactly once. Explicit value lists are cycled through instead.
+    """
+    rng = random.Random(seed)
+    columns: dict[str, list[float]] = {}
+    for name, axis in axes.items():
+        if isinstance(axis, tuple):
+            lo, hi = axis
+            col = [lo + (hi - lo) * (i + rng.random()) / n for i in range(n)]
+        else:
+            col = [axis[i % len(axis)] for i in range(n)]
+        rng.shuffle(col)
+        columns[name] = col
+    return [{name: columns[name][i] for name in axes} for i in range(n)]
+
+
+def apply_point(base: GameConfig, point: dict[str, float]) -> GameConfig:
+    return dataclasses.replace(base, **{k: float(v) for k, v in point.items()})
+
+
+def _cache_key(cfg: GameConfig, tasks: list[FarmTask], frames: int) -> str:
+    spec = json.dumps([config_hash(cfg), [t.run_id for t in tasks], frames]).encode("utf-8")
+    return hashlib.sha1(spec).hexdigest()[:16]
+
+
+def _read_cached(path: str) -> list[dict] | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["rows"]
+    except Exception:
+        return None
+
+
+def _write_cached(path: str, cfg: GameConfig, rows: list[dict]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"config": sim_config(cfg), "rows": rows}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(
+    points: list[dict[str, float]],
+    tasks: list[FarmTask],
+    *,
+    base: GameConfig,
+    cache_dir: str,
+    frames: int = 36000,
+    workers: int | None = None,
+    progress=None,
+) -> list[list[dict]]:
+    """
+    Bot result rows for every point, in `points` order.
+
+    A point whose runs are all done is cached in `cache_dir` under a hash of its
+    simulation config, the task ids and `frames`; cached points are not re-run, so
+    overlapping or interrupted sweeps only pay for new points. All (point, task) runs
+    share one process pool.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cfgs = [apply_point(base, p) for p in points]
+    paths = [os.path.join(cache_dir, f"{_cache_key(cfg, tasks, frames)}.json") for cfg in cfgs]
+    cached = {path: _read_cached(path) for path in paths}
+    # One entry per distinct uncached config (duplicate points share their runs).
+    todo = {path: cfg for path, cfg in zip(paths, cfgs) if cached[path] is None}
+    path_of = {id(cfg): path for path, cfg in todo.items()}
+    partial: dict[str, list[dict]] = {}
+
+    done = 0
+    total = len(todo) * len(tasks)
+    jobs = pool_imap(simulate, ((t, cfg, frames) for cfg in todo.values() for t in tasks), workers)
+    with closing(jobs):
+        for (_, cfg, _), row in jobs:
+            path = path_of[id(cfg)]
+            rows = partial.setdefault(path, [])
+            rows.append(row)
+            if len(rows) == len(tasks):
+                rows.sort(key=lambda r: r["id"])
+                _write_cached(path, cfg, rows)
+                cached[path] = rows
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    return [cached[path] or [] for path in paths]
+
+
+def survival_curve(rows: list[dict], floors: list[int]) -> list[float]:
+    """Share of runs that reached at least each floor in `floors`."""
+    n = len(rows)
+    return [sum(1 for r in rows if r["floor"] >= f) / n if n else 0.0 for f in floors]
+
+
+def write_csv(path: str, points: list[dict[str, float]], results: list[list[dict]], floor_step: int) -> None:
+    """Long format, one line per (point, floor): ready for a pivot or a line plot."""
+    top = max((r["floor"] for rows in results for r in rows), default=0)
+    floors = list(range(0, top + floor_step, floor_step))
+    names = list(points[0]) if points else []
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["point", *names, "runs", "floor", "survival"])
+        for i, (point, rows) in enumerate(zip(points, results)):
+            for floor, share in zip(floors, survival_curve(rows, floors)):
+                w.writerow([i, *(point[n] for n in names), len(rows), floor, round(share, 4)])
+
+
+def _median_floor(rows: list[dict]) -> float | None:
+    floors = sorted(r["floor"] for r in rows)
+    if not floors:
+        return None
+    mid = len(floors) // 2
+    return floors[mid] if len(floors) % 2 else (floors[mid - 1] + floors[mid]) / 2
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=LO:HI|A,B,C",
+        help=f"axis to sweep (repeatable): {', '.join(SWEEP_FIELDS)}",
+    )
+    ap.add_argument("--grid", type=int, default=3, help="values per range axis for a full grid (default: 3)")
+    ap.add_argument("--lhs", type=int, default=0, help="use N Latin-hypercube points instead of a grid")
+    ap.add_argument("--lhs-seed", type=int, default=0, help="sampling seed for --lhs")
+    ap.add_argument("--runs", type=int, default=100, help="bot runs per point (default: 100)")
+    ap.add_argument("--prompts", default="default", help="comma-separated theme prompts, used round-robin")
+    ap.add_argument("--frames", type=int, default=36000, help="max simulation steps per run")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--floor-step", type=int, default=5, help="floor spacing of the survival curve (default: 5)")
+    ap.add_argument("--cache-dir", default=os.path.join("save", "sweep"), help="finished points, by config hash")
+    ap.add_argument("--csv", default=os.path.join("save", "sweep", "survival.csv"), help="survival curves (CSV)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m game --sweep", description="Sweep config fields with bot runs.")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    try:
+        axes = dict(parse_axis(spec) for spec in args.param)
+    except ValueError as e:
+        ap.error(str(e))
+    if not axes:
+        ap.error("give at least one --param")
+    points = lhs_points(axes, args.lhs, args.lhs_seed) if args.lhs > 0 else grid_points(axes, args.grid)
+    prompts = [p.strip() for p in args.prompts.split(",") if p.strip()] or ["default"]
+    tasks = make_tasks(prompts, args.runs)
+
+    def progress(done: int, total: int) -> None:
+        sys.stderr.write(f"\r{done}/{total} runs\033[K")
+        sys.stderr.flush()
+
+    try:
+        results = run_sweep(
+            points,
+            tasks,
+            base=GameConfig.load(),
+            cache_dir=args.cache_dir,
+            frames=args.frames,
+            workers=args.workers,
+            progress=progress,
+        )
+    except KeyboardInterrupt:
+        sys.stderr.write(f"\ninterrupted; finished points are cached in {args.cache_dir}\n")
+        return 130
+    sys.stderr.write("\n")
+    write_csv(args.csv, points, results, max(1, args.floor_step))
+    summary = [{**point, "median_floor": _median_floor(rows)} for point, rows in zip(points, results)]
+    json.dump({"csv": args.csv, "points": summary}, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
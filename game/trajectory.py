@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from game.constants import (
+    GRAVITY,
+    HEIGHT,
+    JUMP_MAX_VY,
+    JUMP_MIN_VY,
+    PLAYER_MAX_X_SPEED,
+    PLAYER_X_ACCEL,
+    SIM_HZ,
+)
+from game.util import lerp
+
+if TYPE_CHECKING:
+    from game.world import PlayWorld
+
+# Charge is sampled at 0, 1/N, ..., 1.
+TABLE_CHARGES = 64
+# Height resolution of the landing / min-charge tables.
+HEIGHT_BUCKET_PX = 4
+# Arcs are traced until the feet are this far below the take-off height.
+ARC_DROP_PX = HEIGHT // 2
+
+
+class JumpTable:
+    """
+    Jump arcs per charge, integrated step by step like `PlayWorld.step`. Heights are
+    "rise" above the take-off feet; lookups round toward the safe side.
+    """
+
+    def __init__(self, jump_mult: float, gravity_mult: float, speed_mult: float, dt: float = 1.0 / SIM_HZ) -> None:
+        self.jump_mult = jump_mult
+        self.gravity_mult = gravity_mult
+        self.speed_mult = speed_mult
+        self.dt = dt
+        g = GRAVITY * gravity_mult
+        n = TABLE_CHARGES
+
+        self._arcs: list[list[float]] = []
+        self._apex: list[float] = []
+        self._apex_step: list[int] = []
+        for ci in range(n + 1):
+            vy = -lerp(JUMP_MIN_VY, JUMP_MAX_VY, ci / n) * jump_mult
+            y = 0.0
+            arc: list[float] = []
+            while y < ARC_DROP_PX:
+                vy += g * dt
+                y += vy * dt
+                arc.append(-y)
+            top = max(range(len(arc)), key=arc.__getitem__)
+            self._arcs.append(arc)
+            self._apex.append(arc[top])
+            self._apex_step.append(top)
+
+        # _land[ci][b]: steps until the feet are back down to rise b * HEIGHT_BUCKET_PX
+        # (the first step at or below it after the apex). Filled top-down so the scan
+        # over the descending part only moves forward.
+        self._land: list[list[int]] = []
+        for ci in range(n + 1):
+            arc = self._arcs[ci]
+            land = [0] * (int(self._apex[ci] // HEIGHT_BUCKET_PX) + 1)
+            k = self._apex_step[ci]
+            for b in range(len(land) - 1, -1, -1):
+                h = b * HEIGHT_BUCKET_PX
+                while arc[k] > h:
+                    k += 1
+                land[b] = k + 1
+            self._land.append(land)
+
+        # _min_charge[b]: smallest charge index whose apex clears b * HEIGHT_BUCKET_PX.
+        self._min_charge: list[int] = []
+        ci = 0
+        for b in range(int(self._apex[n] // HEIGHT_BUCKET_PX) + 1):
+            while self._apex[ci] < b * HEIGHT_BUCKET_PX:
+                ci += 1
+            self._min_charge.append(ci)
+
+        # _reach[k]: px covered in k steps holding a direction from vx = 0 (air control).
+        accel = PLAYER_X_ACCEL * speed_mult
+        max_speed = PLAYER_MAX_X_SPEED * speed_mult
+        vx = 0.0
+        x = 0.0
+        self._reach: list[float] = [0.0]
+        for _ in range(max(len(a) for a in self._arcs) + 1):
+            vx = min(max_speed, vx + accel * dt)
+            x += vx * dt
+            self._reach.append(x)
+
+    @staticmethod
+    def _ci(charge: float) -> int:
+        return max(0, min(TABLE_CHARGES, int(charge * TABLE_CHARGES)))
+
+    def apex(self, charge: float = 1.0) -> float:
+        """Highest rise (px) of a jump released at `charge`."""
+        return self._apex[self._ci(charge)]
+
+    def arc(self, charge: float) -> list[float]:
+        """Rise after each step of a jump released at `charge` (shared list: don't modify)."""
+        return self._arcs[self._ci(charge)]
+
+    def air_steps(self, charge: float, rise: float) -> int | None:
+        """Steps until a jump at `charge` lands on a top `rise` px up; None if it can't get there."""
+        ci = self._ci(charge)
+        land = self._land[ci]
+        b = max(0, math.ceil(rise / HEIGHT_BUCKET_PX))
+        if b < len(land):
+            return land[b]
+        # Just under the apex: it lands right after the top (the safe, shorter estimate).
+        return self._apex_step[ci] + 1 if rise <= self._apex[ci] else None
+
+    def charge_for(self, rise: float) -> float | None:
+        """Smallest charge whose apex clears `rise` px; None if even a full charge doesn't."""
+        b = max(0, math.ceil(rise / HEIGHT_BUCKET_PX))
+        if b < len(self._min_charge):
+            return self._min_charge[b] / TABLE_CHARGES
+        # Between the last bucket and the full-charge apex itself.
+        return 1.0 if rise <= self._apex[TABLE_CHARGES] else None
+
+    def reach_px(self, steps: int) -> float:
+        """Sideways distance (px) the player can cover from standstill in `steps`."""
+        reach = self._reach
+        return reach[min(max(0, steps), len(reach) - 1)]
+
+    def can_reach(self, rise: float, gap: float) -> bool:
+        """Whether a top `rise` px up and `gap` px sideways is reachable (a full charge decides)."""
+        steps = self.air_steps(1.0, rise)
+        return steps is not None and self.reach_px(steps) >= gap
+
+
+@lru_cache(maxsize=32)
+def _cached(jump_mult: float, gravity_mult: float, speed_mult: float) -> JumpTable:
+    return JumpTable(jump_mult, gravity_mult, speed_mult)
+
+
+def jump_table(jump_mult: float, gravity_mult: float, speed_mult: float) -> JumpTable:
+    """Shared table for these multipliers (rounded to 1e-4, so float noise still hits the cache)."""
+    return _cached(round(jump_mult, 4), round(gravity_mult, 4), round(speed_mult, 4))
+
+
+def table_for(world: PlayWorld) -> JumpTable:
+    """Table for the player's current multipliers (item boosts included)."""
+    p = world.player
+    return jump_table(p.jump_mult(), world.gravity / GRAVITY, p.x_speed_mult())
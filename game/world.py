@@ -0,0 +1,490 @@
+from __future__ import annotations
+
+import pickle
+import struct
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+
+from game.character import CharacterSpec
+from game.chunks import GIANT_MIN_FLOOR, ChunkGenerator, LayoutKey, Row
+from game.collision import swept_contacts
+from game.config import GameConfig
+from game.constants import (
+    FLOOR_HEIGHT_PX,
+    GRAVITY,
+    HEIGHT,
+    PLAYER_H,
+    PLAYER_W,
+    REBASE_FLOORS,
+    WIDTH,
+)
+from game.effects import HitStop
+from game.entities.enemy import Enemy
+from game.entities.enemy_store import make_enemy_store
+from game.entities.item import Item
+from game.entities.ordered import YOrderedDeque
+from game.entities.platform import Platform, PlatformIndex
+from game.entities.player import Player
+from game.geom import Rect
+from game.input import InputState
+from game.pool import Pool
+from game.rng import RngStreams
+from game.spatial import SpatialHash
+from game.util import clamp
+from game.zones import zone_for_floor
+
+# Not snapshotted: tooling, scratch, the RNG registry (restored in place) and the chunk generator.
+_SNAPSHOT_SKIP = frozenset({"_cfg", "rng", "chunks", "profile", "_mark_t", "_events", "_contacts"})
+
+_CHECKSUM_HEAD = struct.Struct("<qqqqdddddd")
+_CHECKSUM_ENEMY = struct.Struct("<qqq")
+
+
+@dataclass(frozen=True)
+class WorldEvent:
+    """For the presentation layer; `value` is the zone index ("zone_change") or y shift ("rebase")."""
+
+    kind: str
+    x: int = 0
+    y: int = 0
+    value: int = 0
+
+
+def _item_taken(item: Item) -> bool:
+    return item.taken
+
+
+def _new_platform() -> Platform:
+    return Platform(Rect(0, 0, 0, 0))
+
+
+def _new_item() -> Item:
+    return Item(kind="hp", rect=Rect(0, 0, 0, 0))
+
+
+def _release_item(grid: SpatialHash[Item], pool: Pool[Item], item: Item) -> None:
+    grid.remove(item)
+    pool.release(item)
+
+
+class PlayWorld:
+    """The play simulation, without pyxel: `step()` advances one tick and returns its events."""
+
+    def __init__(self, cfg: GameConfig, rng: RngStreams | None = None) -> None:
+        self._cfg = cfg
+        self.rng = rng if rng is not None else RngStreams()
+        self.chunks = ChunkGenerator()
+
+        self.player = Player(x=0, y=0, vx=0, vy=0)
+        self._platform_pool: Pool[Platform] = Pool(_new_platform, Platform.reset)
+        self._item_pool: Pool[Item] = Pool(_new_item, Item.reset)
+        self._item_grid: SpatialHash[Item] = SpatialHash()
+        self.platforms = PlatformIndex(on_remove=self._platform_pool.release)
+        self.items: YOrderedDeque[Item] = YOrderedDeque(
+            _item_taken, on_remove=partial(_release_item, self._item_grid, self._item_pool)
+        )
+        self.enemies = make_enemy_store()
+
+        self.camera_x = 0.0
+        self.camera_y = 0.0
+        self.start_y = 0.0
+        self.min_y = 0.0
+        self.floor = 0
+        self.zone_index = 0
+        # Floating origin: absolute y = y - origin_y (see `_rebase`).
+        self.origin_y = 0
+        self.rebase_floors = REBASE_FLOORS
+
+        self.water_y = 0.0
+        self.gravity = GRAVITY
+        # State at the start of the last step, for render interpolation.
+        self.prev_player_x = 0.0
+        self.prev_player_y = 0.0
+        self.prev_camera_y = 0.0
+        self.prev_water_y = 0.0
+        self.hitstop = HitStop()
+
+        self.frame = 0
+        self.time = 0.0
+        self.over = False
+        self.reason = "defeated"
+        self.charging = False
+
+        self._spawn_top_y = 0.0
+        self._layout: LayoutKey | None = None
+        self._ground_row = Row(0, 0, 0)
+        self._pending_rows: deque[Row] = deque()
+        self._next_chunk = 0
+        self._chunk_tail = self._ground_row
+        self._was_grounded = False
+        self._last_water_warn_frame = -10**9
+        self._events: list[WorldEvent] = []
+        self._contacts: list = []
+        self._prev_rect = Rect(0, 0, PLAYER_W, PLAYER_H)
+        self._sweep_rect = Rect(0, 0, PLAYER_W, PLAYER_H)
+
+        # Per-phase wall time, filled by step() when set to a dict.
+        self.profile: dict[str, float] | None = None
+        self._mark_t = 0.0
+
+    def reset(self, *, seed: int, character: CharacterSpec) -> None:
+        self.rng.seed(seed)
+
+        self.start_y = 320.0
+        self.player = Player(x=WIDTH / 2 - 16, y=self.start_y, vx=0, vy=0)
+        ch_eff = character.effective()
+        self.player.trait_speed_mult = ch_eff.speed_mult
+        self.player.trait_jump_mult = ch_eff.jump_mult
+        self.player.trait_charge_mult = ch_eff.charge_mult
+        self.player.max_hp = max(1, int(ch_eff.base_hp))
+        self.player.hp = self.player.max_hp
+        self.gravity = GRAVITY * ch_eff.gravity_mult
+
+        self.platforms.clear()
+        self.items.clear()
+        self.enemies.clear()
+        self._item_grid.clear()
+        self.hitstop = HitStop()
+
+        self.min_y = self.player.y
+        self.floor = 0
+        self.zone_index = 0
+        self.origin_y = 0
+
+        ground = self._platform_pool.acquire(40, int(self.start_y + 90), WIDTH - 80, 26)
+        self.platforms.append(ground)
+
+        self._spawn_top_y = self.start_y + 90
+        self._layout = LayoutKey(
+            seed=int(seed),
+            start_y=int(self.start_y),
+            jump_mult=self.player.trait_jump_mult,
+            gravity_mult=ch_eff.gravity_mult,
+            speed_mult=self.player.trait_speed_mult,
+        )
+        self._ground_row = Row(ground.rect.x, ground.rect.top, ground.rect.w)
+        self._pending_rows.clear()
+        self._next_chunk = 0
+        self._chunk_tail = self._ground_row
+        self.chunks.configure(self._layout, self._ground_row)
+        self.water_y = self.start_y + self._cfg.water_start_offset
+        self.frame = 0
+        self.time = 0.0
+        self.over = False
+        self.reason = "defeated"
+        self.charging = False
+        self._was_grounded = True
+        self._last_water_warn_frame = -10**9
+
+        for _ in range(24):
+            self._spawn_more()
+
+        self.camera_y = self.player.y - self._cfg.scroll_start_player_screen_y
+        self.camera_x = 0.0
+        self._store_prev()
+
+    def _rebase(self) -> None:
+        """Shift everything down by whole floors so the camera is back near y=0."""
+        dy = int(-self.camera_y // FLOOR_HEIGHT_PX) * FLOOR_HEIGHT_PX
+        if dy <= 0:
+            return
+        self.origin_y += dy
+        self.player.y += dy
+        self.camera_y += dy
+        self.start_y += dy
+        self.min_y += dy
+        self.water_y += dy
+        self._spawn_top_y += dy
+        self.platforms.shift_y(dy)
+        for item in self.items:
+            item.rect.move_ip(0, dy)
+        self._item_grid.rebuild()
+        self.enemies.shift_y(dy)
+        self._emit("rebase", value=dy)
+
+    def _store_prev(self) -> None:
+        self.prev_player_x = self.player.x
+        self.prev_player_y = self.player.y
+        self.prev_camera_y = self.camera_y
+        self.prev_water_y = self.water_y
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "platforms": self._platform_pool.stats(),
+            "items": self._item_pool.stats(),
+            "enemies": self.enemies.stats(),
+        }
+
+    def snapshot(self) -> bytes:
+        """Everything `step()` reads or writes, RNG included."""
+        state = {k: v for k, v in self.__dict__.items() if k not in _SNAPSHOT_SKIP}
+        return pickle.dumps((state, self.rng.snapshot()), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, data: bytes) -> None:
+        """Return to a `snapshot()` of a world with the same config."""
+        state, rng_state = pickle.loads(data)
+        self.__dict__.update(state)
+        self.rng.restore(rng_state)
+        self._events.clear()
+        if self._layout is not None:
+            self.chunks.configure(self._layout, self._ground_row)
+
+    def state_checksum(self) -> int:
+        """CRC32 of the outcome-relevant state, for replay verification."""
+        p = self.player
+        crc = zlib.crc32(
+            _CHECKSUM_HEAD.pack(
+                self.frame, self.floor, self.origin_y, p.hp, p.x, p.y, p.vx, p.vy, self.water_y, self.camera_y
+            )
+        )
+        for e in self.enemies:
+            r = e.rect
+            crc = zlib.crc32(_CHECKSUM_ENEMY.pack(r.x, r.y, e.state), crc)
+        return crc
+
+    def current_floor(self) -> int:
+        return max(0, int((self.start_y - self.min_y) / FLOOR_HEIGHT_PX))
+
+    def _emit(self, kind: str, pos: tuple[int, int] = (0, 0), value: int = 0) -> None:
+        self._events.append(WorldEvent(kind, pos[0], pos[1], value))
+
+    def _spawn_more(self) -> None:
+        if not self._pending_rows:
+            chunk = self.chunks.take(self._next_chunk, self._chunk_tail)
+            self._pending_rows.extend(chunk.rows)
+            self._chunk_tail = chunk.tail
+            self._next_chunk += 1
+        row = self._pending_rows.popleft()
+        y = row.y + self.origin_y
+
+        plat = self._platform_pool.acquire(row.x, y, row.w, 22)
+        self.platforms.append(plat)
+        self._spawn_top_y = y
+
+        if row.item is not None:
+            item = self._item_pool.acquire(row.item, plat.rect.centerx - 12, plat.rect.top - 28, 24, 24)
+            self.items.append(item)
+            self._item_grid.insert(item)
+
+        kind = row.enemy_with_giants if self.current_floor() >= GIANT_MIN_FLOOR else row.enemy
+        if kind is not None:
+            ex = plat.rect.centerx - 20
+            ey = plat.rect.top - 36
+            if kind == "flyer":
+                ey -= 70
+            elif kind == "giant":
+                ex -= 40
+                ey -= 30
+            self.enemies.spawn(kind, ex, ey)
+
+    def _apply_item(self, kind: str) -> None:
+        if kind == "speed":
+            self.player.speed_boost = max(self.player.speed_boost, 6.0)
+        elif kind == "jump":
+            self.player.jump_boost = max(self.player.jump_boost, 6.0)
+        elif kind == "phase":
+            self.player.phase = max(self.player.phase, 4.0)
+        elif kind == "invuln":
+            self.player.invuln_item = max(self.player.invuln_item, 4.0)
+        elif kind == "hp":
+            self.player.heal_max_hp(1)
+
+    def _stomp_kill(self, enemy: Enemy) -> None:
+        self.enemies.kill(enemy)
+        self.hitstop.trigger(frames=4)
+        self._emit("stomp", enemy.rect.center)
+        self.player.vy = -540.0 * self.player.jump_mult()
+
+    def _player_sweep(self, prev_rect: Rect) -> tuple[Rect, int, int]:
+        pr = self.player.rect()
+        start = self._sweep_rect
+        start.copy_from(prev_rect)
+        dx = pr.x - prev_rect.x
+        if abs(dx) > WIDTH // 2:
+            # Phase wrap teleported across the screen: only sweep the vertical part.
+            start.x = pr.x
+            dx = 0
+        return start, dx, pr.y - prev_rect.y
+
+    def _enemy_collisions(self, start: Rect, dx: int, dy: int) -> None:
+        if self.player.can_phase():
+            return
+
+        pr = self.player.rect()
+        # Earliest contact along the move wins, so a fast fall can't tunnel through a flyer.
+        for toi, e in swept_contacts(start, dx, dy, self.enemies.overlapping_swept(start, dx, dy), self._contacts):
+            falling = self.player.vy > 50.0
+            stomp = falling and start.bottom + dy * toi <= e.rect.top + 6
+            if stomp and e.can_stomp:
+                if e.kind == "spiker" and e.state == 1:
+                    stomp = False
+                if stomp:
+                    self._stomp_kill(e)
+                    return
+
+            took = self.player.apply_damage(1)
+            if not took:
+                return
+            self._emit("hit", e.rect.center)
+            if self.player.hp <= 0:
+                self.reason = "hp"
+                return
+
+            if pr.centerx < e.rect.centerx:
+                self.player.vx = -320
+            else:
+                self.player.vx = 320
+            self.player.vy = -420
+
+    def _platform_collisions(self, *, prev_x: float, prev_y: float) -> None:
+        # Robust "swept" landing check to avoid tunneling through thin platforms
+        # when falling fast or when int rounding changes edges.
+        if self.player.vy < 0.0:
+            return
+
+        left = self.player.x
+        right = self.player.x + PLAYER_W
+        prev_bottom = prev_y + PLAYER_H
+        cur_bottom = self.player.y + PLAYER_H
+
+        # Only platforms whose top was crossed this step can be landed on; the
+        # first one crossed (highest) wins.
+        for p in self.platforms.tops_between(prev_bottom, cur_bottom + 1.0):
+            if right <= p.rect.left or left >= p.rect.right:
+                continue
+
+            self.player.y = float(p.rect.top) - PLAYER_H
+            self.player.vy = 0.0
+            self.player.grounded = True
+            return
+
+    def _mark(self, phase: str) -> None:
+        prof = self.profile
+        if prof is None:
+            return
+        now = time.perf_counter()
+        prof[phase] = prof.get(phase, 0.0) + (now - self._mark_t)
+        self._mark_t = now
+
+    def _end(self, reason: str) -> None:
+        self.reason = reason
+        self.over = True
+
+    def step(self, dt: float, inp: InputState) -> list[WorldEvent]:
+        """Advance one tick. The returned list is reused: consume it before the next step."""
+        self._events.clear()
+        if self.over:
+            return self._events
+
+        self.frame += 1
+        if self.rebase_floors > 0 and self.camera_y < -self.rebase_floors * FLOOR_HEIGHT_PX:
+            self._rebase()
+        self._store_prev()
+        if self.hitstop.consume_frame():
+            return self._events
+        self.time += dt
+        if self.profile is not None:
+            self._mark_t = time.perf_counter()
+
+        while self._spawn_top_y > self.camera_y - HEIGHT * 2.0:
+            self._spawn_more()
+        self._mark("spawn")
+
+        self.player.update_timers(dt)
+        self.player.update_horizontal(dt, inp.left, inp.right)
+
+        jumped = self.player.update_jump_charge(dt, inp.jump_down, inp.jump_released)
+        if jumped:
+            self.charging = False
+            self._emit("jump", self.player.rect().center)
+        else:
+            self.charging = self.player.grounded and inp.jump_down and self.player.charge > 0.02
+
+        prev_x = self.player.x
+        prev_y = self.player.y
+        prev_rect = self._prev_rect
+        prev_rect.copy_from(self.player.rect())
+        self.player.grounded = False
+
+        self.player.vy += self.gravity * dt
+        self.player.x += self.player.vx * dt
+        self.player.y += self.player.vy * dt
+
+        if not self.player.can_phase():
+            self.player.x = clamp(self.player.x, 0, WIDTH - prev_rect.w)
+        else:
+            if self.player.x < -prev_rect.w:
+                self.player.x = WIDTH - 1
+            elif self.player.x > WIDTH:
+                self.player.x = -prev_rect.w + 1
+
+        self._mark("player")
+        self._platform_collisions(prev_x=prev_x, prev_y=prev_y)
+        self._mark("platforms")
+        start, dx, dy = self._player_sweep(prev_rect)
+        self._enemy_collisions(start, dx, dy)
+        self._mark("enemy_collisions")
+
+        if (not self._was_grounded) and self.player.grounded:
+            self._emit("land", self.player.rect().center)
+        self._was_grounded = self.player.grounded
+
+        pr = self.player.rect()
+        for _, item in swept_contacts(start, dx, dy, self._item_grid.query_swept(start, dx, dy), self._contacts):
+            if item.taken:
+                continue
+            item.taken = True
+            self._item_grid.remove(item)
+            self.items.discard(item)
+            self._apply_item(item.kind)
+            self._emit("pickup", item.rect.center)
+        self._mark("items")
+
+        floor = self.current_floor()
+        prev_floor = self.floor
+        self.floor = max(self.floor, floor)
+        self.min_y = min(self.min_y, self.player.y)
+
+        prev_zone = zone_for_floor(prev_floor, step=self._cfg.zone_floor_step)
+        cur_zone = zone_for_floor(self.floor, step=self._cfg.zone_floor_step)
+        if cur_zone.index != prev_zone.index:
+            self.zone_index = cur_zone.index
+            self._emit("zone_change", value=cur_zone.index)
+
+        water_speed = self._cfg.water_base_speed + self.floor * self._cfg.water_speed_per_floor
+        self.water_y -= water_speed * dt
+        water_dist = self.water_y - pr.bottom
+        if water_dist < 180 and self.frame - self._last_water_warn_frame > 55:
+            self._last_water_warn_frame = self.frame
+            self._emit("water_warn")
+        if pr.bottom > self.water_y:
+            self._end("water")
+            return self._events
+
+        if self.player.hp <= 0:
+            self._end(self.reason)
+            return self._events
+
+        target_cam_y = self.player.y - self._cfg.scroll_start_player_screen_y
+        self.camera_y = min(self.camera_y, target_cam_y)
+        self.camera_x = 0.0
+
+        # Everything this far below the camera is out of reach for good.
+        cutoff = self.camera_y + HEIGHT * 2.5
+        self._mark("progress")
+        view_y = (self.camera_y, self.camera_y + HEIGHT)
+        self.enemies.update(dt, world_bounds_x=(0, WIDTH), view_y=view_y, cull_y=cutoff)
+        self._mark("enemies")
+
+        self.platforms.cull_below(cutoff)
+        self.items.cull_below(cutoff)
+        self._mark("cull")
+
+        if pr.y > self.camera_y + HEIGHT + self._cfg.fall_below_screen_px:
+            self._end("fall")
+            return self._events
+
+        return self._events
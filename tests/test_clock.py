@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from game.clock import FixedStepClock
+
+STEP = 1.0 / 60.0
+
+
+@pytest.mark.parametrize("fps", [50, 55, 58, 60, 62, 65, 68, 75])
+def test_game_time_tracks_wall_time(fps: int) -> None:
+    clock = FixedStepClock(STEP)
+    frames = fps * 100
+    steps = sum(clock.advance(1.0 / fps) for _ in range(frames))
+    assert steps * STEP == pytest.approx(100.0, abs=2 * STEP)
+
+
+def test_jitter_near_one_step_runs_one_step_per_frame() -> None:
+    clock = FixedStepClock(STEP)
+    rng = random.Random(0)
+    counts = [clock.advance(STEP + rng.uniform(-0.0008, 0.0008)) for _ in range(600)]
+    assert counts.count(1) >= 590
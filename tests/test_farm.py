@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from game.config import GameConfig
+from game.farm import make_tasks, read_results, run_farm
+
+
+def test_resume_is_keyed_by_tasks_and_frames(tmp_path) -> None:
+    out = str(tmp_path / "runs.jsonl")
+    cfg = GameConfig.load()
+    first = make_tasks(["aaa"], 4)
+    rows = run_farm(first, out_path=out, cfg=cfg, frames=60, workers=1)
+    assert sorted(r["id"] for r in rows) == sorted(t.run_id for t in first)
+
+    # Other prompts in the same file don't leak into this farm's rows.
+    other = make_tasks(["zzz"], 2)
+    rows = run_farm(other, out_path=out, cfg=cfg, frames=60, workers=1)
+    assert sorted(r["id"] for r in rows) == ["zzz#0", "zzz#1"]
+
+    # Same tasks again: everything is reused, nothing appended.
+    assert len(run_farm(first, out_path=out, cfg=cfg, frames=60, workers=1)) == 4
+    assert len(read_results(out)) == 6
+
+    # A different frame limit is a different run.
+    rows = run_farm(other, out_path=out, cfg=cfg, frames=90, workers=1)
+    assert {r["frame_limit"] for r in rows} == {90}
+    assert len(read_results(out)) == 8
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from game.bot import HeuristicBot
+from game.character import CharacterSpec
+from game.config import GameConfig
+from game.constants import SIM_HZ
+from game.input import InputState
+from game.rewind import RewindBuffer, first_divergence
+from game.world import PlayWorld
+
+DT = 1.0 / SIM_HZ
+SEED = 3
+
+
+class _NudgedWorld(PlayWorld):
+    """Drifts from a normal world by one pixel at `NUDGE_FRAME`."""
+
+    NUDGE_FRAME = 137
+
+    def step(self, dt, inp):
+        events = super().step(dt, inp)
+        if self.frame == self.NUDGE_FRAME:
+            self.player.x += 1.0
+        return events
+
+
+def _world(cls=PlayWorld) -> PlayWorld:
+    world = cls(GameConfig.load())
+    world.reset(seed=SEED, character=CharacterSpec.from_seed(SEED))
+    return world
+
+
+def _bot_inputs(frames: int) -> list[InputState]:
+    world = _world()
+    bot = HeuristicBot()
+    inputs: list[InputState] = []
+    for _ in range(frames):
+        inp = bot(world)
+        inputs.append(inp)
+        world.step(DT, inp)
+    return inputs
+
+
+def test_seek_reproduces_checksums() -> None:
+    inputs = _bot_inputs(900)
+    world = _world()
+    buf = RewindBuffer(every=30, keyframe_every=4)
+    sums = {0: world.state_checksum()}
+    buf.capture(world)
+    for inp in inputs:
+        world.step(DT, inp)
+        sums[world.frame] = world.state_checksum()
+        buf.maybe_capture(world)
+    for frame in (0, 1, 29, 30, 31, 455, 899):
+        buf.seek(world, frame, lambda k: inputs[k - 1], DT)
+        assert world.frame == frame
+        assert world.state_checksum() == sums[frame]
+
+
+def test_first_divergence_finds_the_frame() -> None:
+    inputs = _bot_inputs(600)
+    at = lambda k: inputs[k - 1]  # noqa: E731
+    assert first_divergence(_world(), _world(), at, len(inputs), DT) is None
+    assert first_divergence(_world(), _world(_NudgedWorld), at, len(inputs), DT) == _NudgedWorld.NUDGE_FRAME